@@ -0,0 +1,229 @@
+"""
+Benchmarks for the data and report paths, run against generated data.
+
+    python bench.py                              # 1k and 100k, print results
+    python bench.py --sizes 1k 100k 1m           # add the 1M run (slow, several GB of RAM)
+    python bench.py --save bench_baseline.json   # record a new baseline
+    python bench.py --compare bench_baseline.json
+
+Each size runs in its own process against a generated data folder
+(AID_DATA_DIR), so nothing here touches the real data files. Every path is
+timed on its own, then run again under tracemalloc for its peak memory and
+what it left allocated (except the PDF export above 10k requests). --compare exits with status 1 if
+any path got more than --tolerance times slower than the baseline; paths
+under 10 ms in the baseline are shown but too noisy to fail on.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SIZES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+DEFAULT_SIZES = ["1k", "100k"]
+SEED = 20240501
+AID_TYPES = ["Hostel", "Counselling", "Finance"]
+STATUSES = ["Pending", "Pending", "Accepted", "Declined"]
+DUMMY_UPLOADS = 20
+# Appends timed by the save_aid_request benchmark
+SAVE_COUNT = 1000
+# Account edits timed by the update_user benchmark, written out in one flush
+UPDATE_COUNT = 1000
+SEARCH_QUERIES = ["a", "ab", "A12", "stu", "stu123", "4567", "nobody-matches", "student99"]
+# The PDF export is the slowest path by far; skip it above this many requests,
+# and skip its tracemalloc pass (which runs several times slower) above the second
+PDF_LIMIT = 100000
+PDF_MEMORY_LIMIT = 10000
+MIN_COMPARE_SECONDS = 0.01
+
+
+# --------------------- DATA ---------------------
+def generate_dataset(data_dir, count, seed=SEED):
+    """ Writes users.txt, guidance.txt, admin.txt, headminister.txt, aid_requests.txt
+    and a few dummy uploads with count students and count aid requests. The same
+    seed always gives the same files. """
+    rng = random.Random(seed)
+    uploads_dir = os.path.join(data_dir, "uploads")
+    os.makedirs(uploads_dir, exist_ok=True)
+    uploads = []
+    for i in range(DUMMY_UPLOADS):
+        name = f"uploads/document_{i}.pdf"
+        with open(os.path.join(data_dir, name), "wb") as file:
+            file.write(rng.randbytes(rng.randint(1024, 64 * 1024)))
+        uploads.append(name)
+
+    with open(os.path.join(data_dir, "admin.txt"), "w") as file:
+        file.write("admin1:admin123\n")
+    with open(os.path.join(data_dir, "headminister.txt"), "w") as file:
+        file.write("HM:123\n")
+    with open(os.path.join(data_dir, "guidance.txt"), "w") as file:
+        for i, aid_type in enumerate(AID_TYPES):
+            file.write(f"officer{i}:123:01{rng.randint(10000000, 99999999)}:{aid_type}\n")
+    with open(os.path.join(data_dir, "users.txt"), "w") as file:
+        for i in range(1, count + 1):
+            file.write(f"A{i}:student{i}:{rng.randint(1000, 9999)}:{rng.randint(0, 5000)}.0|"
+                       f"{rng.randint(1, 999)} Jalan {rng.choice('ABCDEFGH')}|01{rng.randint(10000000, 99999999)}\n")
+
+    # One JSON line per request, written as it is generated
+    with open(os.path.join(data_dir, "aid_requests.txt"), "w") as file:
+        for i in range(1, count + 1):
+            request = {
+                "request_id": f"AID{i:04d}",
+                "username": f"student{rng.randint(1, count)}",
+                "aid_type": rng.choice(AID_TYPES),
+                "description": " ".join(rng.choice(["need", "help", "with", "fees", "rent", "books", "family",
+                                                    "support", "this", "semester"]) for _ in range(rng.randint(5, 40))),
+                "documents": rng.sample(uploads, rng.randint(0, 3)),
+                "status": rng.choice(STATUSES),
+            }
+            file.write(json.dumps(request) + "\n")
+
+
+# --------------------- BENCHMARKS ---------------------
+# Each benchmark is (name, setup, run). setup() returns the argument for run()
+# and is not timed. The modules are imported inside the child process, after
+# AID_DATA_DIR points at the generated data.
+def benchmarks(data_dir, count):
+    import storage
+    import reports
+
+    # The generated files are brand new; let the startup cache take them anyway
+    storage.STARTUP_CACHE_SETTLE_SECONDS = 0
+
+    def loaded():
+        storage.load_all()
+
+    def without_cache():
+        storage.clear_loaded_data()
+        if os.path.exists(storage.STARTUP_CACHE_FILE):
+            os.remove(storage.STARTUP_CACHE_FILE)
+
+    def with_cache():
+        if not os.path.exists(storage.STARTUP_CACHE_FILE):
+            storage.load_all()
+        storage.clear_loaded_data()
+
+    def save_requests(_):
+        ids = storage.allocate_ids("aid_request", SAVE_COUNT)
+        for request_id in ids:
+            storage.save_aid_request(request_id, "student1", "Finance", "benchmark request", [])
+
+    def update_users(_):
+        user_ids = list(storage.users_dict)[:UPDATE_COUNT]
+        for i, user_id in enumerate(user_ids):
+            user = storage.users_dict[user_id]
+            storage.update_user(user_id, storage.User(user.username, user.password, user.balance + i,
+                                                      user.address, user.phonenumber))
+        storage.write_behind.flush(force=True)
+
+    def search(_):
+        for query in SEARCH_QUERIES:
+            storage.search_users(query, 200)
+
+    cases = [
+        # Cold start: parses the files and writes the startup cache
+        ("load_all", without_cache, lambda _: storage.load_all()),
+        ("load_all_cached", with_cache, lambda _: storage.load_all()),
+        ("readuser", lambda: storage.users_dict.clear(), lambda _: storage.readuser()),
+        ("load_aid_requests", lambda: None, lambda _: storage.load_aid_requests()),
+        ("save_aid_request_x1000", loaded, save_requests),
+        ("update_user_x1000", loaded, update_users),
+        # The first search builds the index, so time it separately from warm queries
+        ("search_first_query", loaded, lambda _: storage.search_users("stu", 200)),
+        ("search_8_queries", lambda: (loaded(), storage.search_users("", 1)), search),
+        ("report_text", loaded, lambda _: reports.write_report_text(os.path.join(data_dir, "report.txt"))),
+    ]
+    if count <= PDF_LIMIT:
+        cases.append(("report_pdf", loaded, lambda _: reports.write_report_pdf(os.path.join(data_dir, "report.pdf"))))
+    return cases
+
+def run_child(size, memory):
+    count = SIZES[size]
+    data_dir = os.environ["AID_DATA_DIR"]
+    started = time.perf_counter()
+    generate_dataset(data_dir, count)
+    results = {"generate_seconds": round(time.perf_counter() - started, 3), "paths": {}}
+    for name, setup, run in benchmarks(data_dir, count):
+        argument = setup()
+        started = time.perf_counter()
+        run(argument)
+        entry = {"seconds": round(time.perf_counter() - started, 4)}
+        if memory and not (name == "report_pdf" and count > PDF_MEMORY_LIMIT):
+            argument = setup()
+            tracemalloc.start()
+            run(argument)
+            current, peak = tracemalloc.get_traced_memory()
+            entry["peak_mb"] = round(peak / 2 ** 20, 2)
+            # What the path left allocated; for the load paths, the size of the loaded data
+            entry["retained_mb"] = round(current / 2 ** 20, 2)
+            tracemalloc.stop()
+        results["paths"][name] = entry
+        print(f"  {size:>5} {name:<24} {entry['seconds']:>9.3f}s" +
+              (f" {entry['peak_mb']:>9.1f} MB peak {entry['retained_mb']:>9.1f} MB kept" if "peak_mb" in entry else ""),
+              file=sys.stderr)
+    print(json.dumps(results))
+
+
+# --------------------- DRIVER ---------------------
+def run_size(size, memory):
+    with tempfile.TemporaryDirectory(prefix=f"aid-bench-{size}-") as data_dir:
+        env = dict(os.environ, AID_DATA_DIR=data_dir, AID_STORAGE="files")
+        command = [sys.executable, os.path.abspath(__file__), "--child", size]
+        if not memory:
+            command.append("--no-memory")
+        output = subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, size_results in results["sizes"].items():
+        base_paths = baseline.get("sizes", {}).get(size, {}).get("paths", {})
+        for name, entry in size_results["paths"].items():
+            base = base_paths.get(name)
+            if not base or not base["seconds"]:
+                continue
+            ratio = entry["seconds"] / base["seconds"]
+            flag = "  REGRESSION" if ratio > tolerance and base["seconds"] >= MIN_COMPARE_SECONDS else ""
+            print(f"{size:>5} {name:<24} {base['seconds']:>9.3f}s -> {entry['seconds']:>9.3f}s  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append((size, name))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the aid system's data and report paths.")
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=DEFAULT_SIZES)
+    parser.add_argument("--save", metavar="FILE", help="write the results as a new baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, not args.no_memory)
+        return
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "sizes": {size: run_size(size, not args.no_memory) for size in args.sizes},
+    }
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4)
+        print(f"Baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import storage
+from storage import document_index
+
+# Uploaded documents are stored by content: each file is copied once into
+# uploads/blobs/<first two hex digits>/<sha256>, hashing it while it streams,
+# so the same payslip uploaded fifty times is kept once and two students'
+# "transcript.pdf" never overwrite each other. Aid requests refer to documents
+# by id (DOC000001, ...); uploads/documents.jsonl maps each id to its blob and
+# the original filename. Requests saved before this still hold plain relative
+# paths such as "uploads/transcript.pdf", which keep working.
+
+UPLOADS_DIR = os.path.join(storage.DATA_DIR, "uploads")
+BLOBS_DIR = os.path.join(UPLOADS_DIR, "blobs")
+DOCUMENT_INDEX_FILE = os.path.join(UPLOADS_DIR, "documents.jsonl")
+DOCUMENT_INDEX_LOCK_FILE = DOCUMENT_INDEX_FILE + ".lock"
+COPY_CHUNK_BYTES = 1024 * 1024
+
+class TransferCancelled(Exception):
+    pass
+
+index_lock = threading.Lock()
+# How far into documents.jsonl we have read; other instances append to it too
+index_state = {"offset": 0}
+
+def blob_path(digest):
+    return os.path.join(BLOBS_DIR, digest[:2], digest)
+
+# Read entries appended since we last looked. Caller holds index_lock.
+def read_index_tail():
+    try:
+        with open(DOCUMENT_INDEX_FILE, "rb") as file:
+            file.seek(index_state["offset"])
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                index_state["offset"] += len(raw)
+                try:
+                    entry = json.loads(raw)
+                    document_index[entry["id"]] = {"digest": entry["digest"], "name": entry["name"], "size": entry["size"]}
+                except (json.JSONDecodeError, KeyError) as e:
+                    print(f"Skipping bad entry in {DOCUMENT_INDEX_FILE}: {e}")
+    except FileNotFoundError:
+        pass
+
+# Copy src to dest in chunks, optionally hashing as it goes so the file is
+# read exactly once. progress(bytes done, total bytes) is called after each
+# chunk; if cancelled() turns true the partial copy is removed and
+# TransferCancelled raised. Safe to run on a worker thread.
+def copy_chunked(src, dest, progress=None, cancelled=None, digest=None):
+    total = os.path.getsize(src)
+    size = 0
+    try:
+        with open(src, "rb") as source, open(dest, "wb") as target:
+            while True:
+                if cancelled and cancelled():
+                    raise TransferCancelled()
+                chunk = source.read(COPY_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if digest:
+                    digest.update(chunk)
+                target.write(chunk)
+                size += len(chunk)
+                if progress:
+                    progress(size, total)
+    except BaseException:
+        if os.path.exists(dest):
+            os.remove(dest)
+        raise
+    return size
+
+# Takes the same progress and cancelled callbacks as copy_chunked
+def hash_file(path, progress=None, cancelled=None):
+    total = os.path.getsize(path)
+    size = 0
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(COPY_CHUNK_BYTES), b""):
+            if cancelled and cancelled():
+                raise TransferCancelled()
+            digest.update(chunk)
+            size += len(chunk)
+            if progress:
+                progress(size, total)
+    return digest.hexdigest(), size
+
+# Put the content of src into the blob store and return (digest, size).
+# Only touches files, so it can run on a worker thread; register_document
+# then gives it an id.
+def store_blob(src, progress=None, cancelled=None):
+    os.makedirs(BLOBS_DIR, exist_ok=True)
+    temp_path = os.path.join(BLOBS_DIR, f".upload-{os.getpid()}-{threading.get_ident()}.tmp")
+    linked = False
+    if os.path.abspath(src).startswith(os.path.abspath(UPLOADS_DIR) + os.sep):
+        # Files already in the uploads folder (older plain uploads) are hard
+        # linked into the blob store instead of copied
+        digest, size = hash_file(src, progress, cancelled)
+        try:
+            os.link(src, temp_path)
+            linked = True
+        except OSError:
+            pass
+    if not linked:
+        digest = hashlib.sha256()
+        size = copy_chunked(src, temp_path, progress, cancelled, digest)
+        digest = digest.hexdigest()
+    target = blob_path(digest)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.exists(target):
+        # Already stored; keep the existing blob
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, target)
+    return digest, size
+
+# Record a stored blob under a new document id. Allocates the id through
+# storage, so call it from the thread that owns storage (the Tk thread).
+def register_document(digest, name, size):
+    with index_lock:
+        # Ids already in the index seed the sequence the first time it's used
+        read_index_tail()
+    doc_id = storage.allocate_id("document")
+    entry = {"id": doc_id, "digest": digest, "name": name, "size": size}
+    with index_lock, storage.file_lock(DOCUMENT_INDEX_LOCK_FILE):
+        read_index_tail()
+        with open(DOCUMENT_INDEX_FILE, "a+b") as file:
+            # Drop a torn line left by a crash before appending
+            file.truncate(index_state["offset"])
+            line = (json.dumps(entry) + "\n").encode()
+            file.write(line)
+        index_state["offset"] += len(line)
+        document_index[doc_id] = {"digest": digest, "name": name, "size": size}
+    return doc_id
+
+# Copy a stored document out to dest, through a temp file so a cancelled or
+# failed copy never leaves a half-written file behind
+def copy_file(src, dest, progress=None, cancelled=None):
+    temp_path = dest + ".part"
+    copy_chunked(src, temp_path, progress, cancelled)
+    os.replace(temp_path, dest)
+
+# The index is read lazily: the first lookup reads the whole file, later
+# misses only read what other instances have appended since
+def lookup(doc):
+    if doc not in document_index and "/" not in doc and "\\" not in doc:
+        with index_lock:
+            read_index_tail()
+    return document_index.get(doc)
+
+# Name to show for a document reference (document id or legacy path)
+def display_name(doc):
+    entry = lookup(doc)
+    return entry["name"] if entry else os.path.basename(doc)
+
+# Absolute path of the stored file, or None if it can't be found
+def resolve_path(doc):
+    entry = lookup(doc)
+    if entry:
+        path = blob_path(entry["digest"])
+    else:
+        path = os.path.join(storage.DATA_DIR, doc)
+        # Older requests name a file in the uploads folder; never follow one out of it
+        if not os.path.abspath(path).startswith(os.path.abspath(UPLOADS_DIR) + os.sep):
+            return None
+    return path if os.path.exists(path) else None
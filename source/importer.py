@@ -0,0 +1,154 @@
+"""
+Bulk import of student accounts from a CSV or JSONL file.
+
+    python importer.py students.csv [--rejects rejected.csv] [--batch-size 1000]
+
+CSV files need a header row; JSONL files hold one object per line. Fields:
+username and password (required), balance, address, phonenumber. Rows are
+validated as they stream in and committed in batches, each batch getting its
+ids in one allocation and reaching the data files in one write.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+import storage
+
+BATCH_SIZE = 1000
+# Characters that would break a line of users.txt
+FORBIDDEN_CHARACTERS = (":", "|", "\n", "\r")
+
+
+class ImportProgress:
+    """ Running totals for one import; rejected holds (line number, reason, raw row). """
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.rejected = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+# Yields (line number, row dict or None, error or None)
+def iter_rows(path):
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, None, "Expected a JSON object"
+                    continue
+                yield line_number, row, None
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row, None
+
+# Turn a raw row into a User, or raise ValueError with the reason
+def validate_row(row, seen_usernames):
+    fields = {
+        "username": str(row.get("username") or "").strip(),
+        "password": str(row.get("password") or "").strip(),
+        "address": str(row.get("address") or "").strip() or "Not Provided",
+        "phonenumber": str(row.get("phonenumber") or "").strip() or "Not Provided",
+    }
+    if not fields["username"] or not fields["password"]:
+        raise ValueError("username and password are required")
+    for field, value in fields.items():
+        if any(character in value for character in FORBIDDEN_CHARACTERS):
+            raise ValueError(f"{field} may not contain ':' or '|'")
+    try:
+        balance = float(row.get("balance") or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"balance is not a number: {row.get('balance')!r}")
+    if storage.username_taken(fields["username"]) or fields["username"] in seen_usernames:
+        raise ValueError(f"username {fields['username']!r} is already taken")
+    return storage.User(balance=balance, **fields)
+
+def commit_batch(batch):
+    user_ids = storage.allocate_ids("user", len(batch))
+    storage.add_users(list(zip(user_ids, batch)))
+
+def iter_import(path, batch_size=BATCH_SIZE):
+    """ Imports path, yielding the ImportProgress after every committed batch.
+
+    Runs on the caller's thread; the GUI steps through it with root.after so
+    the window keeps responding between batches.
+    """
+    progress = ImportProgress()
+    batch = []
+    seen_usernames = set()
+    for line_number, row, error in iter_rows(path):
+        progress.rows += 1
+        if error is None:
+            try:
+                user = validate_row(row, seen_usernames)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            progress.rejected.append((line_number, error, row))
+            continue
+        seen_usernames.add(user.username)
+        batch.append(user)
+        if len(batch) >= batch_size:
+            commit_batch(batch)
+            progress.imported += len(batch)
+            batch = []
+            progress.seconds = time.perf_counter() - progress.started
+            yield progress
+    if batch:
+        commit_batch(batch)
+        progress.imported += len(batch)
+    progress.seconds = time.perf_counter() - progress.started
+    yield progress
+
+def import_users(path, batch_size=BATCH_SIZE):
+    progress = None
+    for progress in iter_import(path, batch_size):
+        pass
+    return progress
+
+def write_rejects(progress, path):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["line", "reason", "row"])
+        for line_number, reason, row in progress.rejected:
+            writer.writerow([line_number, reason, json.dumps(row) if row is not None else ""])
+
+def summary(progress):
+    return (f"Imported {progress.imported} of {progress.rows} rows in {progress.seconds:.1f}s "
+            f"({progress.rows_per_second():.0f} rows/s), {len(progress.rejected)} rejected.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import student accounts from a CSV or JSONL file.")
+    parser.add_argument("path")
+    parser.add_argument("--rejects", help="write every rejected row to this CSV file")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} not found")
+    storage.load_all()
+    progress = import_users(args.path, args.batch_size)
+    print(summary(progress))
+    for line_number, reason, row in progress.rejected[:20]:
+        print(f"  line {line_number}: {reason}")
+    if len(progress.rejected) > 20:
+        print(f"  ... and {len(progress.rejected) - 20} more")
+    if args.rejects:
+        write_rejects(progress, args.rejects)
+        print(f"Rejected rows written to {args.rejects}")
+
+
+if __name__ == "__main__":
+    main()
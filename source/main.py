@@ -1,9 +1,19 @@
+import time
+# Start of the import phase for the startup timings
+IMPORT_STARTED = time.perf_counter()
 from tkinter import *
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, ttk
+import csv
 import os
-import json
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import storage
+import reports
+import documents
+import importer
+from storage import (admin_dict, users_dict, guidance_dict, headmin_dict, aid_requests, request_stats,
+                     request_queues, save_aid_request, set_aid_request_status, User, GuidanceOfficer)
 
 # Get the current file directory dynamically
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,121 +22,181 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FIGURE_IMAGE_PATH = os.path.join(BASE_DIR, "assets", "loginpage", "image_1.png")
 HELP_IMAGE_PATH = os.path.join(BASE_DIR, "assets", "loginpage", "image_2.png")
 
-# Define file paths
-ADMIN_FILE_PATH = os.path.join(BASE_DIR, "admin.txt")
-USER_FILE_PATH = os.path.join(BASE_DIR, "users.txt")
-GUIDANCE_FILE_PATH = os.path.join(BASE_DIR, "guidance.txt")
-HEADMIN_FILE_PATH = os.path.join(BASE_DIR, "headminister.txt")
-AID_REQUESTS_FILE = os.path.join(BASE_DIR, "aid_requests.txt")
-
-# Initialize dictionaries
-admin_dict = {}
-users_dict = {}
-guidance_dict = {}
-headmin_dict = {}
-
-# Load admin data
-def readadmin():
-    try:
-        with open(ADMIN_FILE_PATH, "r") as file:
-            for line in file:
-                username, password = line.strip().split(":")
-                admin_dict[username] = password
-    except FileNotFoundError:
-        print(f"Warning: {ADMIN_FILE_PATH} not found.")
-
-# Load user data
-def readuser():
-    line = None
-    try:
-        with open(USER_FILE_PATH, "r") as file:
-            for line in file:
-                parts = line.strip().split(":")
-                if len(parts) < 4:
-                    continue
-                user_id, username, password, balance_and_contact = parts[:4]
-                balance_parts = balance_and_contact.split("|")
-                balance = float(balance_parts[0])
-                address = balance_parts[1] if len(balance_parts) > 1 and balance_parts[1] != "-" else "Not Provided"
-                phonenumber = balance_parts[2] if len(balance_parts) > 2 and balance_parts[2] != "-" else "Not Provided"
-                users_dict[user_id] = {
-                    "username": username,
-                    "password": password,
-                    "balance": balance,
-                    "address": address,
-                    "phonenumber": phonenumber
-                }
-    except FileNotFoundError:
-        print(f"Warning: {USER_FILE_PATH} not found.")
-    except ValueError as e:
-        print(f"Error parsing line: {line}. Error: {e}")
-
-# Load guidance data
-def readguidance():
-    """ Reads guidance user details from the file and loads them into guidance_dict correctly. """
-    try:
-        with open(GUIDANCE_FILE_PATH, "r") as file:
-            for line in file:
-                username, password, phonenumber, department = line.strip().split(":")
-                guidance_dict[username] = {
-                    "username": username,
-                    "password": password,
-                    "phonenumber": phonenumber,
-                    "department": department
-                }
-    except FileNotFoundError:
-        print(f"Warning: {GUIDANCE_FILE_PATH} not found.")
-
-# Load head minister data
-def readheadminister():
-    try:
-        with open(HEADMIN_FILE_PATH, "r") as file:
-            for line in file:
-                username, password = line.strip().split(":")
-                headmin_dict[username] = password
-    except FileNotFoundError:
-        print(f"Warning: {HEADMIN_FILE_PATH} not found.")
-
-# Load aid requests
-def load_aid_requests():
-    if os.path.exists(AID_REQUESTS_FILE):
-        with open(AID_REQUESTS_FILE, "r") as file:
-            content = file.read().strip()
-            if content:
-                try:
-                    loaded_requests = json.loads(content)
-                    return {req['request_id']: req for req in loaded_requests}
-                except json.JSONDecodeError as e:
-                    print(f"Error decoding JSON: {e}")
-                    return {}
+# How often to pick up requests created or decided in other running copies
+SYNC_INTERVAL_MS = 3000
+# How often to write out account changes that have sat for storage.WRITE_BEHIND_SECONDS
+FLUSH_INTERVAL_MS = 200
+# User search screens wait for a pause in typing, then show at most this many matches
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_LIMIT = 200
+# Requests per page in the guidance work queue
+QUEUE_PAGE_SIZE = 8
+# File uploads/downloads copied in parallel
+TRANSFER_WORKERS = 4
+
+
+# Which screens show data affected by each kind of change. Only these are
+# rebuilt after the change, and only when they are next shown. Screens like
+# the *_details views are filled in each time they are shown, so they never
+# go stale. Screens listing aid requests (the reports and the work queue)
+# update themselves through storage.subscribe_requests instead.
+USER_LIST_FRAMES = [
+    "check_user_details",
+    "check_user_details_guidance",
+    "check_user_details_headminister",
+    "admin_delete_user",
+    "headminister_delete_user",
+]
+VIEW_DEPENDENCIES = {
+    "user_added": USER_LIST_FRAMES,
+    # The head minister's search list shows usernames, and the student's own
+    # update form is pre-filled from their record
+    "user_updated": ["check_user_details_headminister", "update_user_details"],
+    "user_deleted": USER_LIST_FRAMES,
+    # The work queue shows the officer's department
+    "guidance_updated": ["update_guidance_details", "guidance_view_aid"],
+}
+
+# --------------------- VIRTUAL REQUEST LIST ---------------------
+class VirtualRequestList(Frame):
+    """ Scrollable list of aid request cards that only builds widgets for the rows in view.
+
+    Cards have a fixed height, so the row under any scroll offset is a simple
+    division. A small pool of cards is reused and refilled as the user scrolls,
+    which keeps build time and memory the same for 10 or 100,000 requests.
+    Long descriptions are cut short to fit a card; clicking one opens the full text.
+    """
+    ROW_HEIGHT = 200
+    DESCRIPTION_LIMIT = 160
+
+    def __init__(self, parent):
+        Frame.__init__(self, parent, bg="#f4f4f9")
+        self.request_ids = []
+        self.rows = []
+        self.canvas = Canvas(self, bg="#f4f4f9", highlightthickness=0)
+        self.scrollbar = Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Enter>", self.bind_mousewheel)
+        self.canvas.bind("<Leave>", self.unbind_mousewheel)
+
+    # keep_scroll stays at the same place in the list instead of going back to the top
+    def set_requests(self, request_ids, keep_scroll=False):
+        top = self.canvas.yview()[0] if keep_scroll else 0
+        self.request_ids = request_ids
+        if keep_scroll:
+            # The scroll region has to match the new list before moving in it
+            self.redraw()
+        self.canvas.yview_moveto(top)
+        self.redraw()
+
+    def append_request(self, request_id):
+        self.request_ids.append(request_id)
+        self.redraw()
+
+    def refresh_request(self, request_id):
+        self.refresh_requests((request_id,))
+
+    def refresh_requests(self, request_ids):
+        # Only cards currently showing one of these requests need new text
+        request_ids = set(request_ids)
+        for window, values in self.rows:
+            if self.canvas.itemcget(window, "state") != "hidden" and values["request_id"].cget("text") in request_ids:
+                self.fill_row(values, values["request_id"].cget("text"))
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def bind_mousewheel(self, event):
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self.on_mousewheel)
+
+    def unbind_mousewheel(self, event):
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+    def create_row(self):
+        card = Frame(self.canvas, bg="white", bd=2, relief="groove", padx=10, pady=10)
+        values = {}
+        fields = [("request_id", "Request ID:"), ("username", "Username:"), ("aid_type", "Aid Type:"),
+                  ("status", "Status:"), ("description", "Description:"), ("documents", "Documents:")]
+        for row, (key, title) in enumerate(fields):
+            Label(card, text=title, font=("Calibri", 12, "bold"), bg="white") \
+                .grid(row=row, column=0, sticky="nw" if key == "description" else "w", padx=5, pady=2)
+            values[key] = Label(card, text="", font=("Calibri", 12), bg="white", wraplength=500, justify="left")
+            values[key].grid(row=row, column=1, sticky="w", padx=5, pady=2)
+        values["description"].bind("<Button-1>", lambda e: self.show_description(values["request_id"].cget("text")))
+        window = self.canvas.create_window(10, 0, window=card, anchor="nw")
+        return window, values
+
+    def fill_row(self, values, req_id):
+        details = aid_requests[req_id]
+        description = details.description
+        truncated = len(description) > self.DESCRIPTION_LIMIT
+        if truncated:
+            description = description[:self.DESCRIPTION_LIMIT] + "... (click to read all)"
+        documents_text = ", ".join(map(documents.display_name, details.documents)) if details.documents else "None"
+        values["request_id"].config(text=req_id)
+        values["username"].config(text=details.username)
+        values["aid_type"].config(text=details.aid_type)
+        values["status"].config(text=details.status)
+        values["description"].config(text=description, cursor="hand2" if truncated else "")
+        values["documents"].config(text=documents_text)
+
+    # Full description of a request in its own scrollable window
+    def show_description(self, req_id):
+        details = aid_requests.get(req_id)
+        if details is None or len(details.description) <= self.DESCRIPTION_LIMIT:
+            return
+        window = Toplevel(self, bg="#f4f4f9", padx=20, pady=20)
+        window.title(f"Request {req_id}")
+        window.transient(self.winfo_toplevel())
+        Label(window, text=f"{req_id} - {details.username} ({details.aid_type})", font=("Calibri", 12, "bold"),
+              bg="#f4f4f9").pack(anchor="w", pady=(0, 5))
+        text_frame = Frame(window, bg="#f4f4f9")
+        text_frame.pack(fill="both", expand=True)
+        text = Text(text_frame, font=("Calibri", 12), wrap="word", width=60, height=15)
+        scrollbar = Scrollbar(text_frame, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        text.insert("1.0", details.description)
+        text.config(state="disabled")
+        Button(window, text="Close", font=("Calibri", 12), bg="#e60000", fg="white", width=10,
+               command=window.destroy).pack(pady=(10, 0))
+
+    def redraw(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        total_height = len(self.request_ids) * self.ROW_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, width, max(total_height, height)),
+                              yscrollincrement=self.ROW_HEIGHT // 4)
+        # Grow the pool to cover the viewport plus one partially visible row
+        visible_rows = height // self.ROW_HEIGHT + 2
+        while len(self.rows) < visible_rows:
+            self.rows.append(self.create_row())
+        first = int(self.canvas.canvasy(0)) // self.ROW_HEIGHT
+        for offset, (window, values) in enumerate(self.rows):
+            index = first + offset
+            if index < len(self.request_ids) and aid_requests.get(self.request_ids[index]):
+                self.fill_row(values, self.request_ids[index])
+                self.canvas.coords(window, 10, index * self.ROW_HEIGHT)
+                self.canvas.itemconfigure(window, state="normal", width=max(width - 20, 1),
+                                          height=self.ROW_HEIGHT - 10)
             else:
-                return {}
-    return {}
-
-aid_requests = load_aid_requests()
-
-# Save aid request
-def save_aid_request(request_id, username, aid_type, description, documents):
-    aid_requests[request_id] = {
-        "username": username,
-        "aid_type": aid_type,
-        "description": description,
-        "documents": documents,
-        "status": "Pending"
-    }
-    with open(AID_REQUESTS_FILE, "w") as file:
-        formatted_requests = []
-        for req_id, details in aid_requests.items():
-            formatted_requests.append({
-                "request_id": req_id,
-                "username": details["username"],
-                "aid_type": details["aid_type"],
-                "description": details["description"],
-                "documents": details["documents"],
-                "status": details["status"]
-            })
-        json.dump(formatted_requests, file, indent=4)
-    print("Current aid request IDs:", list(aid_requests.keys()))
+                self.canvas.itemconfigure(window, state="hidden")
+
 
 class UniversityAidApp:
     def __init__(self, root):
@@ -138,59 +208,183 @@ class UniversityAidApp:
 
         self.frames = {}
         self.username = None
-        self.details_labels = {}  # For dynamic updates
         self.guidance_request_id_entry = None
         self.guidance_details_text = None
         self.guidance_doc_list = None
-
-        # Create frames
-        self.create_login_frame()
-        self.create_registration_frame()
-        
-        self.create_admin_frame()
-        self.create_admin_add_user_frame()
-        self.create_admin_delete_user_frame()
-        self.create_admin_update_user_details_frame()
-        self.create_report_frame() 
-        self.create_report_headminister_frame()
-
-        self.create_select_user_FOR_details_frame()
-        self.create_user_details_admin_frame()
-
-        self.create_user_frame()
-        self.create_user_apply_aid_frame()
-        self.create_user_view_aid_frame()
-        self.create_user_details_frame()
-        self.create_update_user_details_frame()
-
-        self.create_guidance_frame()
-        self.create_guidance_view_aid_frame()
-        self.create_select_user_for_details_guidance_frame()
-        self.create_guidance_user_details_frame()  
-        self.create_guidance_details_frame()
-        self.create_update_guidance_details_frame()
-
-        self.create_headminister_frame()
-        self.create_select_user_for_details_headminister_frame()
-        self.create_headminister_user_details_frame()
-
-        self.create_headminister_manage_account_frame()
-        self.create_headminister_add_user_frame()
-        self.create_headminister_delete_user_frame()
-        self.create_headminister_update_user_details_frame()
-
-        self.create_manage_account_frame()
+        # (request id, version) of the request the guidance officer last looked at
+        self.viewed_request = (None, None)
+        # Worker threads for uploads and downloads, started on first use
+        self.transfer_pool = None
+        self.pending_uploads = 0
+
+        # Screens are built the first time show_frame asks for them and cached in
+        # self.frames until invalidated, so startup only pays for the login screen.
+        self.frame_factories = {
+            "login": self.create_login_frame,
+            "registration": self.create_registration_frame,
+
+            "admin": self.create_admin_frame,
+            "admin_add_user": self.create_admin_add_user_frame,
+            "admin_delete_user": self.create_admin_delete_user_frame,
+            "update_user_details_admin": self.create_admin_update_user_details_frame,
+            "report": self.create_report_frame,
+            "report_headminister": self.create_report_headminister_frame,
+            "check_user_details": self.create_select_user_FOR_details_frame,
+            "user_details_admin": self.create_user_details_admin_frame,
+            "manage_account": self.create_manage_account_frame,
+
+            "user": self.create_user_frame,
+            "apply_aid": self.create_user_apply_aid_frame,
+            "view_aid": self.create_user_view_aid_frame,
+            "user_details": self.create_user_details_frame,
+            "update_user_details": self.create_update_user_details_frame,
+
+            "guidance": self.create_guidance_frame,
+            "guidance_view_aid": self.create_guidance_view_aid_frame,
+            "check_user_details_guidance": self.create_select_user_for_details_guidance_frame,
+            "user_details_guidance": self.create_guidance_user_details_frame,
+            "guidance_details": self.create_guidance_details_frame,
+            "update_guidance_details": self.create_update_guidance_details_frame,
+
+            "headminister": self.create_headminister_frame,
+            "check_user_details_headminister": self.create_select_user_for_details_headminister_frame,
+            "user_details_headminister": self.create_headminister_user_details_frame,
+            "headminister_manage_account": self.create_headminister_manage_account_frame,
+            "headminister_add_user": self.create_headminister_add_user_frame,
+            "headminister_delete_user": self.create_headminister_delete_user_frame,
+            "update_user_details_headminister": self.create_headminister_update_user_details_frame,
+        }
+        self.current_frame = None
+        self.stale_frames = set()
 
         self.show_frame("login")
+        self.root.after(SYNC_INTERVAL_MS, self.sync_storage)
+        self.root.after(FLUSH_INTERVAL_MS, self.flush_storage)
+
+    # Drive a search Listbox from storage.search_users. Queries run once typing
+    # pauses and the results go into the Listbox in one insert call. Returns a
+    # function that re-runs the current query (e.g. after a delete).
+    def attach_user_search(self, name_entry, name_list, format_item=None):
+        pending = [None]
+
+        def refresh():
+            pending[0] = None
+            results = storage.search_users(name_entry.get().strip(), SEARCH_LIMIT)
+            if format_item is not None:
+                results = [format_item(user_id) for user_id in results]
+            name_list.delete(0, END)
+            if results:
+                name_list.insert(END, *results)
+
+        def on_key(event):
+            if pending[0] is not None:
+                name_entry.after_cancel(pending[0])
+            pending[0] = name_entry.after(SEARCH_DEBOUNCE_MS, refresh)
+
+        name_entry.bind("<KeyRelease>", on_key)
+        refresh()
+        return refresh
+
+    # Bulk import from a CSV/JSONL export. Each batch is committed in its own
+    # root.after step so the window keeps responding; the user lists are
+    # refreshed once at the end.
+    def import_students(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Student lists", "*.csv *.jsonl"), ("All files", "*.*")])
+        if not file_path:
+            return
+        window = Toplevel(self.root, bg="#f4f4f9", padx=20, pady=20)
+        window.title("Importing Students")
+        window.transient(self.root)
+        window.grab_set()
+        status_label = Label(window, text="Reading file...", font=("Calibri", 12), bg="#f4f4f9", width=40)
+        status_label.pack(pady=5)
+        steps = importer.iter_import(file_path)
+        last = [None]
+
+        def step():
+            try:
+                last[0] = next(steps)
+                status_label.config(text=f"Imported {last[0].imported} of {last[0].rows} rows...")
+                self.root.after(1, step)
+                return
+            except StopIteration:
+                pass
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                window.destroy()
+                messagebox.showerror("Error", f"Could not import {file_path}: {e}")
+                if last[0] and last[0].imported:
+                    self.notify_change("user_added")
+                return
+            window.destroy()
+            progress = last[0]
+            self.notify_change("user_added")
+            message = importer.summary(progress)
+            if progress.rejected:
+                rejects_path = os.path.splitext(file_path)[0] + ".rejected.csv"
+                importer.write_rejects(progress, rejects_path)
+                message += "\n\n" + "\n".join(f"Line {line}: {reason}" for line, reason, row in progress.rejected[:10])
+                message += f"\n\nAll rejected rows were saved to:\n{rejects_path}"
+            messagebox.showinfo("Import Finished", message)
+
+        self.root.after(1, step)
+
+    def sync_storage(self):
+        try:
+            storage.sync_aid_requests()
+        except Exception as e:
+            print(f"Error syncing aid requests: {e}")
+        finally:
+            self.root.after(SYNC_INTERVAL_MS, self.sync_storage)
+
+    def flush_storage(self):
+        try:
+            storage.write_behind.flush()
+        except Exception as e:
+            print(f"Error writing account changes: {e}")
+        finally:
+            self.root.after(FLUSH_INTERVAL_MS, self.flush_storage)
+
+    def get_frame(self, frame_name):
+        if frame_name in self.stale_frames:
+            self.stale_frames.discard(frame_name)
+            self.frames.pop(frame_name).destroy()
+        if frame_name not in self.frames:
+            self.frame_factories[frame_name]()
+        return self.frames[frame_name]
+
+    def notify_change(self, change):
+        # Mark the built screens that show this data as stale; each is rebuilt
+        # the next time it is shown rather than straight away.
+        for frame_name in VIEW_DEPENDENCIES[change]:
+            if frame_name in self.frames:
+                self.stale_frames.add(frame_name)
+
+    def invalidate_frame(self, frame_name):
+        # Drop a cached screen so it is rebuilt from fresh data when next shown
+        self.stale_frames.discard(frame_name)
+        frame = self.frames.pop(frame_name, None)
+        if frame is None:
+            return
+        frame.destroy()
+        if frame_name == self.current_frame:
+            self.show_frame(frame_name)
+
+    def start_session(self, username):
+        self.username = username
+        # These screens are pre-filled with the logged-in account's details
+        self.invalidate_frame("update_user_details")
+        self.invalidate_frame("update_guidance_details")
+        self.invalidate_frame("guidance_view_aid")
 
     def show_frame(self, frame_name):
+        frame = self.get_frame(frame_name)
         self.current_frame = frame_name  # Save the current frame name.
-        for frame in self.frames.values():
-            frame.pack_forget()
+        for other in self.frames.values():
+            other.pack_forget()
         if frame_name == "user" and self.username in users_dict:
-            student_name = users_dict[self.username]["username"]
+            student_name = users_dict[self.username].username
             self.user_title_label.config(text=f"Welcome, {student_name} 🎓")
-        self.frames[frame_name].pack(fill="both", expand=True)
+        frame.pack(fill="both", expand=True)
 
     def create_login_frame(self):
         frame = Frame(self.root, bg="white")
@@ -218,25 +412,25 @@ class UniversityAidApp:
             password = password_input.get().strip()
             print(f"Attempting login with ID: {username}, Password: {password}")
             if username in admin_dict and admin_dict[username] == password:
-                self.username = username
+                self.start_session(username)
                 self.show_frame("admin")
                 username_input.delete(0, END)
                 password_input.delete(0, END)
                 login_notif.config(text="", fg="green")
-            elif username in users_dict and users_dict[username]["password"] == password:
-                self.username = username
+            elif username in users_dict and users_dict[username].password == password:
+                self.start_session(username)
                 self.show_frame("user")
                 username_input.delete(0, END)
                 password_input.delete(0, END)
                 login_notif.config(text="", fg="green")
-            elif username in guidance_dict and guidance_dict[username]["password"] == password:
-                self.username = username
+            elif username in guidance_dict and guidance_dict[username].password == password:
+                self.start_session(username)
                 self.show_frame("guidance")
                 username_input.delete(0, END)
                 password_input.delete(0, END)
                 login_notif.config(text="", fg="green")
             elif username in headmin_dict and headmin_dict[username] == password:
-                self.username = username
+                self.start_session(username)
                 self.show_frame("headminister")
                 username_input.delete(0, END)
                 password_input.delete(0, END)
@@ -317,45 +511,22 @@ class UniversityAidApp:
                 self.reg_notif_label.config(text="Passwords do not match.")
                 return
             
-            # Check if the username already exists in users_dict
-            for uid, user in users_dict.items():
-                if user.get("username") == username:
-                    self.reg_notif_label.config(text="Username already taken. Choose another.")
-                    return
-            
-            # Generate a new user id (for example, U0001, U0002, etc.)
-            new_user_id = "A" + format(len(users_dict) + 1)
+            # Check if the username already exists
+            if storage.username_taken(username):
+                self.reg_notif_label.config(text="Username already taken. Choose another.")
+                return
             
-            # Add the new user to the dictionary
-            users_dict[new_user_id] = {
-                "username": username,
-                "password": password,
-                "balance": 0,
-                "address": address,
-                "phonenumber": phone
-            }
+            # Generate a new user id (A1, A2, ...) that is never reused
+            new_user_id = storage.allocate_id("user")
             
-            # Append the new user record to the user file
-            with open(USER_FILE_PATH, "a") as file:
-                file.write(f"{new_user_id}:{username}:{password}:0.0|{address}|{phone}\n")
+            # Add the new user and persist it
+            storage.add_user(new_user_id, User(username, password, 0, address, phone))
             
             self.reg_notif_label.config(text="Registration successful! Redirecting to login...", fg="green")
             clear_registration_entries()
-            self.refresh_frames()
-            self.frames["admin_delete_user"].destroy()
-            self.create_admin_delete_user_frame()
-            self.frames["headminister_delete_user"].destroy()
-            self.create_headminister_delete_user_frame()
+            self.notify_change("user_added")
             frame.after(2000, lambda: self.show_frame("login"))
             self.reg_notif_label.after(2000, lambda: self.reg_notif_label.config(text="", fg="red"))
-
-
-            self.frames["headminister"].destroy()
-            self.frames["check_user_details_headminister"].destroy()
-            self.frames["user_details_headminister"].destroy()
-            self.create_headminister_frame()
-            self.create_select_user_for_details_headminister_frame()
-            self.create_headminister_user_details_frame()
         
         Button(container, text="Register", font=("Calibri", 14), bg="#0073e6", fg="white",
             command=register_user).pack(pady=10)
@@ -365,38 +536,6 @@ class UniversityAidApp:
         
         self.frames["registration"] = frame
 
-    def refresh_frames(self):
-        frames_to_refresh = [
-            "check_user_details",  
-            "check_user_details_guidance", 
-            "check_user_details_headminister",
-            "user_details_admin",
-            "user_details_guidance",
-            "user_details_headminister",
-            "update_user_details",
-            "update_user_details_admin",
-            "update_user_details_headminister",
-            "manage_account",
-            "headminister_manage_account",
-        ]
-        for frame_name in frames_to_refresh:
-            if frame_name in self.frames:
-                self.frames[frame_name].destroy()
-        self.create_user_apply_aid_frame()
-        self.create_user_view_aid_frame()
-        self.create_guidance_view_aid_frame()
-        self.create_select_user_FOR_details_frame()
-        self.create_select_user_for_details_headminister_frame()
-        self.create_select_user_for_details_guidance_frame()
-        self.create_user_details_frame()
-        self.create_user_details_admin_frame()
-        self.create_guidance_user_details_frame()  
-        self.create_update_user_details_frame()
-        self.create_admin_update_user_details_frame()
-        self.create_headminister_update_user_details_frame()
-        self.create_manage_account_frame()
-        self.create_headminister_manage_account_frame()
-
     # ADMIN PART
     def create_admin_frame(self):
         frame = Frame(self.root, bg="#f4f4f9")
@@ -423,6 +562,7 @@ class UniversityAidApp:
         Label(title_bar, text="Manage User Accounts", font=("Comic Sans MS", 20, "bold"), bg="darkblue", fg="white").pack(pady=10)
 
         Button(frame, text="Add User", font=("Calibri", 14), bg="#0073e6", fg="white", width=20, command=lambda: self.show_frame("admin_add_user")).pack(pady=10)
+        Button(frame, text="Import Students", font=("Calibri", 14), bg="#0073e6", fg="white", width=20, command=self.import_students).pack(pady=10)
         Button(frame, text="🗑 Delete User", font=("Calibri", 14), bg="#e60000", fg="white", width=20, command=lambda: self.show_frame("admin_delete_user")).pack(pady=10)
         Button(frame, text="Back", font=("Calibri", 14), bg="#e60000", fg="white", command=lambda: self.show_frame("admin")).pack(pady=10)
         self.frames["manage_account"] = frame
@@ -454,23 +594,13 @@ class UniversityAidApp:
                 add_notif.config(text="Please fill in all fields.", fg="red")
             elif user_id in users_dict:
                 add_notif.config(text="User ID already exists. Please choose a different ID.", fg="red")
+            elif storage.username_taken(newuser_username):
+                add_notif.config(text="Username already taken. Choose another.", fg="red")
             else:
-                users_dict[user_id] = {
-                    "username": newuser_username,
-                    "password": newuser_password,
-                    "balance": 0,
-                    "address": "Not Provided",
-                    "phonenumber": "Not Provided"
-                }
-                with open(USER_FILE_PATH, 'a') as file:
-                    file.write(f"{user_id}:{newuser_username}:{newuser_password}:0.0|Not Provided|Not Provided\n")
+                storage.add_user(user_id, User(newuser_username, newuser_password, 0, "Not Provided", "Not Provided"))
                 add_notif.config(text="User added successfully!", fg="green")
                 frame.after(3000, lambda: add_notif.config(text=""))
-                self.refresh_frames()
-                self.frames["admin_delete_user"].destroy()
-                self.create_admin_delete_user_frame()
-                self.frames["headminister_delete_user"].destroy()
-                self.create_headminister_delete_user_frame()
+                self.notify_change("user_added")
                 new_user_id_input.delete(0, END)
                 new_username_input.delete(0, END)
                 new_password_input.delete(0, END)
@@ -493,25 +623,10 @@ class UniversityAidApp:
         delete_notif = Label(frame, text="", font=("Calibri", 12), bg="#f4f4f9", fg="red")
         delete_notif.pack(pady=10)
 
-        def update(data=None):
-            name_list.delete(0, END)
-            if data is None:
-                data = list(users_dict.keys())
-            for item in data:
-                name_list.insert(END, item)
-
         def fillblank(event):
             name_entry.delete(0, END)
             name_entry.insert(0, name_list.get(ACTIVE))
 
-        def check(event):
-            typed = name_entry.get()
-            if typed == "":
-                data = list(users_dict.keys())
-            else:
-                data = [item for item in users_dict.keys() if typed.lower() in item.lower()]
-            update(data)
-
         def delete_user():
             selected_user = name_list.get(ACTIVE)
             if not selected_user:
@@ -521,24 +636,19 @@ class UniversityAidApp:
             if not confirm:
                 return
             if selected_user in users_dict:
-                del users_dict[selected_user]
-                with open(USER_FILE_PATH, "w") as file:
-                    for user_id, user in users_dict.items():
-                        file.write(f"{user_id}:{user.get('username', 'N/A')}:{user.get('password', 'N/A')}:{user.get('balance', 'Not Provided')}|{user.get('address', 'Not Provided')}|{user.get('phonenumber', 'Not Provided')}\n")
+                storage.delete_user(selected_user)
                 delete_notif.config(text="User deleted successfully!", fg="green")
                 frame.after(3000, lambda: delete_notif.config(text=""))
-                update()
-                self.refresh_frames()
-                self.frames["headminister_delete_user"].destroy()
-                self.create_headminister_delete_user_frame()
+                name_entry.delete(0, END)
+                refresh_search()
+                self.notify_change("user_deleted")
             else:
                 delete_notif.config(text="User not found!", fg="red")
 
         Button(frame, text="Delete", font=("Calibri", 14), bg="#e60000", fg="white", command=delete_user).pack(pady=10)
         Button(frame, text="Back", font=("Calibri", 14), bg="#0073e6", fg="white", command=lambda: self.show_frame("admin")).pack(pady=5)
         name_list.bind("<<ListboxSelect>>", fillblank)
-        name_entry.bind("<KeyRelease>", check)
-        update()
+        refresh_search = self.attach_user_search(name_entry, name_list)
         self.frames["admin_delete_user"] = frame
 
     def create_user_details_admin_frame(self):
@@ -574,13 +684,14 @@ class UniversityAidApp:
 
     def show_user_details_adminVersion(self, user_id):
         if user_id in users_dict:
+            self.get_frame("user_details_admin")
             self.selected_user_id_admin = user_id
             user = users_dict[user_id]
-            self.admin_details_labels["username"].config(text=f"Username: {user.get('username', 'N/A')}")
-            self.admin_details_labels["password"].config(text=f"Password: {user.get('password', 'N/A')}")
-            self.admin_details_labels["balance"].config(text=f"Balance: RM {user.get('balance', 'Not Provided')}")
-            self.admin_details_labels["phonenumber"].config(text=f"Telephone number:\n{user.get('phonenumber', 'Not Provided')}")
-            self.admin_details_labels["address"].config(text=f"Address: {user.get('address', 'Not Provided')}")
+            self.admin_details_labels["username"].config(text=f"Username: {user.username}")
+            self.admin_details_labels["password"].config(text=f"Password: {user.password}")
+            self.admin_details_labels["balance"].config(text=f"Balance: RM {user.balance}")
+            self.admin_details_labels["phonenumber"].config(text=f"Telephone number:\n{user.phonenumber}")
+            self.admin_details_labels["address"].config(text=f"Address: {user.address}")
             self.show_frame("user_details_admin")
         else:
             messagebox.showwarning("Error", "User details not found!")
@@ -597,19 +708,10 @@ class UniversityAidApp:
         name_list = Listbox(frame, width=50)
         name_list.pack(pady=10)
 
-        def update(data=None):
-            name_list.delete(0, END)
-            for item in (data or users_dict.keys()):
-                name_list.insert(END, item)
-
         def fillblank(event):
             name_entry.delete(0, END)
             name_entry.insert(0, name_list.get(ACTIVE))
 
-        def check(event):
-            typed = name_entry.get().strip().lower()
-            update([user_id for user_id in users_dict if typed in user_id.lower()])
-
         def view_user_details():
             selected_user = name_list.get(ACTIVE)
             if selected_user in users_dict:
@@ -620,8 +722,7 @@ class UniversityAidApp:
         Button(frame, text="View Details", font=("Calibri", 14), bg="#0073e6", fg="white", command=view_user_details).pack(pady=10)
         Button(frame, text="Back", font=("Calibri", 14), bg="#e60000", fg="white", command=lambda: self.show_frame("admin")).pack(pady=5)
         name_list.bind("<<ListboxSelect>>", fillblank)
-        name_entry.bind("<KeyRelease>", check)
-        update()
+        self.attach_user_search(name_entry, name_list)
         self.frames["check_user_details"] = frame
 
     def create_admin_update_user_details_frame(self):
@@ -666,18 +767,13 @@ class UniversityAidApp:
             if not username or not password:
                 messagebox.showwarning("Error", "Username and Password must be filled!")
                 return
-            users_dict[user_id] = {
-                "username": username,
-                "password": password,
-                "balance": users_dict[user_id]["balance"],
-                "address": address,
-                "phonenumber": phone
-            }
-            with open(USER_FILE_PATH, "w") as file:
-                for u_id, user in users_dict.items():
-                    file.write(f"{u_id}:{user.get('username', 'N/A')}:{user.get('password', 'N/A')}:{user.get('balance', 'Not Provided')}|{user.get('address', 'Not Provided')}|{user.get('phonenumber', 'Not Provided')}\n")
+            if storage.username_taken(username, user_id):
+                messagebox.showwarning("Error", "Username already taken. Choose another.")
+                return
+            storage.update_user(user_id, User(username, password, users_dict[user_id].balance, address, phone))
             messagebox.showinfo("Success", "User details updated successfully!")
             clear_entries()
+            self.notify_change("user_updated")
             self.show_frame("user_details_admin")
 
         def back_and_clear():
@@ -693,10 +789,9 @@ class UniversityAidApp:
         self.frames["update_user_details_admin"] = frame
 
     # --------------------- REPORT FRAME ---------------------
-    def create_report_frame(self, show=True):
+    def create_report_frame(self):
         # Create a new Frame for the report
         frame = Frame(self.root, bg="#f4f4f9")
-        frame.pack(fill="both", expand=True)
 
         # Title Bar: Title for the report
         title_bar = Frame(frame, bg="#141885", height=80)
@@ -707,75 +802,53 @@ class UniversityAidApp:
             bg="#141885", 
             fg="white").pack(pady=20)
 
-        # Create a canvas with a vertical scrollbar to hold the scrollable content
-        canvas_frame = Frame(frame, bg="#f4f4f9")
-        canvas_frame.pack(fill="both", expand=True)
-        canvas = Canvas(canvas_frame, bg="#f4f4f9", highlightthickness=0)
-        scrollbar = Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = Frame(canvas, bg="#f4f4f9")
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
         # Summary Section: Totals for aid requests
-        summary_frame = Frame(scrollable_frame, bg="#f4f4f9", padx=10, pady=10)
+        summary_frame = Frame(frame, bg="#f4f4f9", padx=10, pady=10)
         summary_frame.pack(fill="x", pady=5)
-        total_requests = len(aid_requests)
-        accepted = sum(1 for req in aid_requests.values() if req["status"] == "Accepted")
-        declined = sum(1 for req in aid_requests.values() if req["status"] == "Declined")
-        pending = sum(1 for req in aid_requests.values() if req["status"] == "Pending")
-        summary_text = (f"Total Aid Requests: {total_requests}    |    Accepted: {accepted}    |    "
-                        f"Declined: {declined}    |    Pending: {pending}")
-        summary_label = Label(summary_frame, text=summary_text, font=("Calibri", 12, "bold"), 
+        summary_label = Label(summary_frame, text="", font=("Calibri", 12, "bold"), 
                             bg="#f4f4f9", fg="#333")
         summary_label.pack()
 
-        # Create a form-like record for each aid request
-        for req_id, details in aid_requests.items():
-            record_frame = Frame(scrollable_frame, bg="white", bd=2, relief="groove", padx=10, pady=10)
-            record_frame.pack(fill="x", padx=10, pady=5)
-            Label(record_frame, text="Request ID:", font=("Calibri", 12, "bold"), bg="white") \
-                .grid(row=0, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=req_id, font=("Calibri", 12), bg="white") \
-                .grid(row=0, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Username:", font=("Calibri", 12, "bold"), bg="white") \
-                .grid(row=1, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=details['username'], font=("Calibri", 12), bg="white") \
-                .grid(row=1, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Aid Type:", font=("Calibri", 12, "bold"), bg="white") \
-                .grid(row=2, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=details['aid_type'], font=("Calibri", 12), bg="white") \
-                .grid(row=2, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Status:", font=("Calibri", 12, "bold"), bg="white") \
-                .grid(row=3, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=details['status'], font=("Calibri", 12), bg="white") \
-                .grid(row=3, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Description:", font=("Calibri", 12, "bold"), bg="white") \
-                .grid(row=4, column=0, sticky="nw", padx=5, pady=2)
-            Label(record_frame, text=details['description'], font=("Calibri", 12), bg="white", 
-                wraplength=500, justify="left") \
-                .grid(row=4, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Documents:", font=("Calibri", 12, "bold"), bg="white") \
-                .grid(row=5, column=0, sticky="w", padx=5, pady=2)
-            documents_text = ", ".join(details['documents']) if details['documents'] else "None"
-            Label(record_frame, text=documents_text, font=("Calibri", 12), bg="white", 
-                wraplength=500, justify="left") \
-                .grid(row=5, column=1, sticky="w", padx=5, pady=2)
+        def update_summary():
+            total_requests = request_stats.count()
+            accepted = request_stats.count("Accepted")
+            declined = request_stats.count("Declined")
+            pending = request_stats.count("Pending")
+            summary_label.config(text=(f"Total Aid Requests: {total_requests}    |    Accepted: {accepted}    |    "
+                                       f"Declined: {declined}    |    Pending: {pending}"))
+        update_summary()
+
+        # Scrollable list of aid requests; only the rows in view get widgets
+        request_list = VirtualRequestList(frame)
+        request_list.pack(fill="both", expand=True)
+        request_list.set_requests(list(aid_requests))
+
+        # Keep the report in step with new requests and decisions without rebuilding it
+        def on_request_change(event, request_id):
+            if event == "reloaded":
+                request_list.set_requests(list(aid_requests), keep_scroll=True)
+            elif event == "batch":
+                # Only statuses changed; request_id is the list of decided ids
+                request_list.refresh_requests(request_id)
+            elif event == "created":
+                request_list.append_request(request_id)
+            else:
+                request_list.refresh_request(request_id)
+            update_summary()
+        storage.subscribe_requests(on_request_change)
+        frame.bind("<Destroy>", lambda e: storage.unsubscribe_requests(on_request_change))
 
         # Footer: Create a frame at the bottom to hold the buttons vertically
         footer_frame = Frame(frame, bg="#f4f4f9", padx=10, pady=10)
         footer_frame.pack(side="bottom", fill="x", pady=10)
 
         def save_report():
-            report_text = self.generate_report_text()
             file_path = filedialog.asksaveasfilename(defaultextension=".txt",
                                                     filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
             if file_path:
                 try:
-                    with open(file_path, "w") as file:
-                        file.write(report_text)
+                    # Streamed to disk chunk by chunk instead of building one big string
+                    reports.write_report_text(file_path)
                     messagebox.showinfo("Report Saved", f"Report successfully saved to:\n{file_path}")
                 except Exception as e:
                     messagebox.showerror("Error", f"Could not save report: {e}")
@@ -785,64 +858,70 @@ class UniversityAidApp:
         back_button.pack(pady=5)
 
         pdf_button = Button(footer_frame, text="Save as PDF", font=("Calibri", 12, "bold"), width=15,bg="#0073e6", fg="white", 
-            command=lambda: self.save_report_as_pdf(self.generate_report_text()))
+            command=self.save_report_as_pdf)
         pdf_button.pack(pady=5)
         
         save_text_button = Button(footer_frame, text="Save Report", font=("Calibri", 12, "bold"), width=15,bg="#0073e6", fg="white", command=save_report)
         save_text_button.pack(pady=5)
 
         self.frames["report"] = frame
-        if show:
-            self.show_frame("report")
-
-    def generate_report_text(self):
-        report_text = "=== University Aid Requests Report ===\n\n"
-        total_requests = len(aid_requests)
-        accepted = sum(1 for req in aid_requests.values() if req["status"] == "Accepted")
-        declined = sum(1 for req in aid_requests.values() if req["status"] == "Declined")
-        pending = sum(1 for req in aid_requests.values() if req["status"] == "Pending")
-        report_text += f"Total Aid Requests: {total_requests}\n"
-        report_text += f"Accepted: {accepted}\n"
-        report_text += f"Declined: {declined}\n"
-        report_text += f"Pending: {pending}\n\n"
-        report_text += "=" * 50 + "\n\n"
-        for req_id, details in aid_requests.items():
-            report_text += f"Request ID: {req_id}\n"
-            report_text += f"Username: {details['username']}\n"
-            report_text += f"Aid Type: {details['aid_type']}\n"
-            report_text += f"Status: {details['status']}\n"
-            report_text += f"Description: {details['description']}\n"
-            if details['documents']:
-                report_text += f"Documents: {', '.join(details['documents'])}\n"
-            else:
-                report_text += "Documents: None\n"
-            report_text += "-" * 50 + "\n"
-        return report_text
 
-    def save_report_as_pdf(self, report_text):
+    def save_report_as_pdf(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".pdf",
                                                  filetypes=[("PDF Files", "*.pdf"), ("All Files", "*.*")])
-        if file_path:
+        if not file_path:
+            return
+
+        # The PDF is rendered on a worker thread; it reports back through a queue
+        # that the Tk thread polls, so the window stays responsive.
+        window = Toplevel(self.root, bg="#f4f4f9", padx=20, pady=20)
+        window.title("Exporting PDF")
+        window.transient(self.root)
+        status_label = Label(window, text="Preparing report...", font=("Calibri", 12), bg="#f4f4f9")
+        status_label.pack(pady=5)
+        progress_bar = ttk.Progressbar(window, length=300, mode="determinate")
+        progress_bar.pack(pady=5)
+        cancel_event = threading.Event()
+        updates = queue.Queue()
+        Button(window, text="Cancel", font=("Calibri", 12), bg="#e60000", fg="white", width=10,
+               command=cancel_event.set).pack(pady=5)
+        window.protocol("WM_DELETE_WINDOW", cancel_event.set)
+
+        def export():
             try:
-                c = canvas.Canvas(file_path, pagesize=letter)
-                width, height = letter
-                x_margin = 50
-                y = height - 50
-                line_height = 15
-                for line in report_text.splitlines():
-                    if y < 50:
-                        c.showPage()
-                        y = height - 50
-                    c.drawString(x_margin, y, line)
-                    y -= line_height
-                c.save()
-                messagebox.showinfo("Report Saved", f"Report successfully saved to:\n{file_path}")
+                reports.write_report_pdf(file_path,
+                                         progress=lambda done, total: updates.put(("progress", done, total)),
+                                         cancelled=cancel_event.is_set)
+                updates.put(("done",))
+            except reports.ReportCancelled:
+                updates.put(("cancelled",))
             except Exception as e:
-                messagebox.showerror("Error", f"Could not save PDF report: {e}")
+                updates.put(("error", e))
+
+        def poll():
+            try:
+                while True:
+                    update = updates.get_nowait()
+                    if update[0] == "progress":
+                        done, total = update[1], update[2]
+                        progress_bar["value"] = 100 * done / total if total else 100
+                        status_label.config(text=f"Exported {done} of {total} requests")
+                        continue
+                    window.destroy()
+                    if update[0] == "done":
+                        messagebox.showinfo("Report Saved", f"Report successfully saved to:\n{file_path}")
+                    elif update[0] == "error":
+                        messagebox.showerror("Error", f"Could not save PDF report: {update[1]}")
+                    return
+            except queue.Empty:
+                pass
+            self.root.after(100, poll)
 
-    def create_report_headminister_frame(self, show=True):
+        threading.Thread(target=export, daemon=True).start()
+        poll()
+
+    def create_report_headminister_frame(self):
         frame = Frame(self.root, bg="#f4f4f9")
-        frame.pack(fill="both", expand=True)
 
         # Title Bar (Top)
         title_bar = Frame(frame, bg="#141885", height=80)
@@ -851,74 +930,53 @@ class UniversityAidApp:
             font=("Comic Sans MS", 20, "bold"), bg="#141885", fg="white")\
             .pack(pady=20)
 
-        # Scrollable Content Area (Middle)
-        canvas_frame = Frame(frame, bg="#f4f4f9")
-        canvas_frame.pack(fill="both", expand=True)
-        canvas_obj = Canvas(canvas_frame, bg="#f4f4f9", highlightthickness=0)
-        scrollbar = Scrollbar(canvas_frame, orient="vertical", command=canvas_obj.yview)
-        scrollable_frame = Frame(canvas_obj, bg="#f4f4f9")
-        scrollable_frame.bind("<Configure>", lambda e: canvas_obj.configure(scrollregion=canvas_obj.bbox("all")))
-        canvas_obj.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas_obj.configure(yscrollcommand=scrollbar.set)
-        canvas_obj.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
         # Summary Section: Display overall statistics of aid requests
-        summary_frame = Frame(scrollable_frame, bg="#f4f4f9", padx=10, pady=10)
+        summary_frame = Frame(frame, bg="#f4f4f9", padx=10, pady=10)
         summary_frame.pack(fill="x", pady=5)
-        total_requests = len(aid_requests)
-        accepted = sum(1 for req in aid_requests.values() if req["status"] == "Accepted")
-        declined = sum(1 for req in aid_requests.values() if req["status"] == "Declined")
-        pending = sum(1 for req in aid_requests.values() if req["status"] == "Pending")
-        summary_text = (f"Total Aid Requests: {total_requests} | Accepted: {accepted} | "
-                        f"Declined: {declined} | Pending: {pending}")
-        Label(summary_frame, text=summary_text, font=("Calibri", 12, "bold"), 
-            bg="#f4f4f9", fg="#333").pack()
-
-        # Display each aid request record
-        for req_id, details in aid_requests.items():
-            record_frame = Frame(scrollable_frame, bg="white", bd=2, relief="groove", padx=10, pady=10)
-            record_frame.pack(fill="x", padx=10, pady=5)
-            Label(record_frame, text="Request ID:", font=("Calibri", 12, "bold"), bg="white")\
-                .grid(row=0, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=req_id, font=("Calibri", 12), bg="white")\
-                .grid(row=0, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Username:", font=("Calibri", 12, "bold"), bg="white")\
-                .grid(row=1, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=details['username'], font=("Calibri", 12), bg="white")\
-                .grid(row=1, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Aid Type:", font=("Calibri", 12, "bold"), bg="white")\
-                .grid(row=2, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=details['aid_type'], font=("Calibri", 12), bg="white")\
-                .grid(row=2, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Status:", font=("Calibri", 12, "bold"), bg="white")\
-                .grid(row=3, column=0, sticky="w", padx=5, pady=2)
-            Label(record_frame, text=details['status'], font=("Calibri", 12), bg="white")\
-                .grid(row=3, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Description:", font=("Calibri", 12, "bold"), bg="white")\
-                .grid(row=4, column=0, sticky="nw", padx=5, pady=2)
-            Label(record_frame, text=details['description'], font=("Calibri", 12), bg="white",
-                wraplength=500, justify="left")\
-                .grid(row=4, column=1, sticky="w", padx=5, pady=2)
-            Label(record_frame, text="Documents:", font=("Calibri", 12, "bold"), bg="white")\
-                .grid(row=5, column=0, sticky="w", padx=5, pady=2)
-            documents_text = ", ".join(details['documents']) if details['documents'] else "None"
-            Label(record_frame, text=documents_text, font=("Calibri", 12), bg="white",
-                wraplength=500, justify="left")\
-                .grid(row=5, column=1, sticky="w", padx=5, pady=2)
+        summary_label = Label(summary_frame, text="", font=("Calibri", 12, "bold"), 
+            bg="#f4f4f9", fg="#333")
+        summary_label.pack()
+
+        def update_summary():
+            total_requests = request_stats.count()
+            accepted = request_stats.count("Accepted")
+            declined = request_stats.count("Declined")
+            pending = request_stats.count("Pending")
+            summary_label.config(text=(f"Total Aid Requests: {total_requests} | Accepted: {accepted} | "
+                                       f"Declined: {declined} | Pending: {pending}"))
+        update_summary()
+
+        # Scrollable Content Area (Middle): only the rows in view get widgets
+        request_list = VirtualRequestList(frame)
+        request_list.pack(fill="both", expand=True)
+        request_list.set_requests(list(aid_requests))
+
+        # Update the affected record and the summary in place when requests change
+        def on_request_change(event, request_id):
+            if event == "reloaded":
+                request_list.set_requests(list(aid_requests), keep_scroll=True)
+            elif event == "batch":
+                # Only statuses changed; request_id is the list of decided ids
+                request_list.refresh_requests(request_id)
+            elif event == "created":
+                request_list.append_request(request_id)
+            else:
+                request_list.refresh_request(request_id)
+            update_summary()
+        storage.subscribe_requests(on_request_change)
+        frame.bind("<Destroy>", lambda e: storage.unsubscribe_requests(on_request_change))
 
         # Footer: Create a frame at the bottom to hold the buttons vertically
         footer_frame = Frame(frame, bg="#f4f4f9")
         footer_frame.pack(side="bottom", pady=10)
 
         def save_report():
-            report_text = self.generate_report_text()
             file_path = filedialog.asksaveasfilename(defaultextension=".txt",
                                                     filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
             if file_path:
                 try:
-                    with open(file_path, "w") as file:
-                        file.write(report_text)
+                    # Streamed to disk chunk by chunk instead of building one big string
+                    reports.write_report_text(file_path)
                     messagebox.showinfo("Report Saved", f"Report successfully saved to:\n{file_path}")
                 except Exception as e:
                     messagebox.showerror("Error", f"Could not save report: {e}")
@@ -927,32 +985,11 @@ class UniversityAidApp:
         Button(footer_frame, text="Back", font=("Calibri", 12, "bold"), bg="#e60000", fg="white",  width=15,
             command=lambda: self.show_frame("headminister")).pack(pady=5)
         Button(footer_frame, text="Save as PDF", font=("Calibri", 12, "bold"), bg="#0073e6", fg="white",  width=15 ,
-            command=lambda: self.save_report_as_pdf(self.generate_report_text())).pack(pady=5)
+            command=self.save_report_as_pdf).pack(pady=5)
         Button(footer_frame, text="Save Report", font=("Calibri", 12, "bold"), bg="#0073e6", fg="white",  width=15 ,
             command=save_report).pack(pady=5)
 
         self.frames["report_headminister"] = frame
-        if show:
-            self.show_frame("report_headminister")
-
-    def refresh_report_frames(self):
-        # Remember the currently visible frame.
-        current = self.current_frame if hasattr(self, "current_frame") else None
-
-        # Refresh admin report frame.
-        if "report" in self.frames:
-            self.frames["report"].destroy()
-        self.create_report_frame(show=False)  # Build without auto-showing.
-
-        # Refresh headminister report frame.
-        if "report_headminister" in self.frames:
-            self.frames["report_headminister"].destroy()
-        self.create_report_headminister_frame(show=False)
-
-        # Return to the current frame (if still available).
-        if current:
-            self.show_frame(current)
-
 
     # USER PART
     def create_user_frame(self):
@@ -979,45 +1016,130 @@ class UniversityAidApp:
         aid_type = self.aid_type_var.get()
         description = self.description_text.get("1.0", END).strip()
         
-        # Use the stored file paths from self.uploaded_files if they exist
-        documents = self.uploaded_files if hasattr(self, "uploaded_files") else []
+        # Document ids of the files uploaded for this request
+        document_ids = self.uploaded_files if hasattr(self, "uploaded_files") else []
         
         if not username or not aid_type or not description:
             messagebox.showerror("Error", "All fields are required!")
             return
-        request_id = f"AID{len(aid_requests) + 1:04d}"
-        save_aid_request(request_id, username, aid_type, description, documents)
+        if self.pending_uploads:
+            messagebox.showerror("Error", "Please wait for your files to finish uploading.")
+            return
+        request_id = storage.allocate_id("aid_request")
+        save_aid_request(request_id, username, aid_type, description, document_ids)
         messagebox.showinfo("Success", f"Aid Request Submitted! Your Request ID: {request_id}")
         self.reset_form()
-        self.refresh_report_frames()  # Update the reports.
 
     def reset_form(self):
         self.username_entry.delete(0, END)
         self.description_text.delete("1.0", END)
         self.file_list.delete(0, END)
+        self.uploaded_files = []
+
+    # Run file copies on the transfer pool with a progress window. jobs is a
+    # list of (name, work) where work(progress, cancelled) does the copy on a
+    # worker thread; on_done(name, result) then runs on the Tk thread for each
+    # one that finished. Progress comes back through a queue polled with
+    # root.after, so the window stays responsive however big the files are.
+    def run_transfers(self, title, jobs, on_done, on_finished=None):
+        if self.transfer_pool is None:
+            self.transfer_pool = ThreadPoolExecutor(max_workers=TRANSFER_WORKERS, thread_name_prefix="transfer")
+        window = Toplevel(self.root, bg="#f4f4f9", padx=20, pady=20)
+        window.title(title)
+        window.transient(self.root)
+        updates = queue.Queue()
+        cancel_events = []
+        rows = []
+        for index, (name, work) in enumerate(jobs):
+            row = Frame(window, bg="#f4f4f9")
+            row.pack(fill="x", pady=3)
+            Label(row, text=name, font=("Calibri", 12), bg="#f4f4f9", width=28, anchor="w").pack(side="left")
+            progress_bar = ttk.Progressbar(row, length=200, mode="determinate")
+            progress_bar.pack(side="left", padx=5)
+            status_label = Label(row, text="Waiting...", font=("Calibri", 10), bg="#f4f4f9", width=12, anchor="w")
+            status_label.pack(side="left")
+            cancel_event = threading.Event()
+            Button(row, text="Cancel", font=("Calibri", 10), command=cancel_event.set).pack(side="left", padx=5)
+            cancel_events.append(cancel_event)
+            rows.append((progress_bar, status_label))
+
+            def transfer(index=index, work=work, cancel_event=cancel_event):
+                try:
+                    result = work(lambda done, total: updates.put(("progress", index, done, total)), cancel_event.is_set)
+                    updates.put(("done", index, result))
+                except documents.TransferCancelled:
+                    updates.put(("cancelled", index, None))
+                except Exception as e:
+                    updates.put(("error", index, e))
+
+            self.transfer_pool.submit(transfer)
+
+        def cancel_all():
+            for cancel_event in cancel_events:
+                cancel_event.set()
+        Button(window, text="Cancel All", font=("Calibri", 12), bg="#e60000", fg="white", width=10,
+               command=cancel_all).pack(pady=5)
+        window.protocol("WM_DELETE_WINDOW", cancel_all)
+
+        remaining = [len(jobs)]
+        errors = []
+
+        def poll():
+            try:
+                while True:
+                    update = updates.get_nowait()
+                    kind, index, value = update[:3]
+                    progress_bar, status_label = rows[index]
+                    if kind == "progress":
+                        total = update[3]
+                        progress_bar["value"] = 100 * value / total if total else 100
+                        status_label.config(text=f"{value // (1024 * 1024)} of {total // (1024 * 1024)} MB")
+                        continue
+                    remaining[0] -= 1
+                    if kind == "done":
+                        progress_bar["value"] = 100
+                        status_label.config(text="Done")
+                        on_done(jobs[index][0], value)
+                    elif kind == "cancelled":
+                        status_label.config(text="Cancelled")
+                    else:
+                        status_label.config(text="Failed")
+                        errors.append(f"{jobs[index][0]}: {value}")
+            except queue.Empty:
+                pass
+            if remaining[0]:
+                self.root.after(100, poll)
+                return
+            window.destroy()
+            if on_finished:
+                on_finished()
+            if errors:
+                messagebox.showerror("Error", "Some files could not be copied:\n" + "\n".join(errors))
+
+        poll()
 
     def upload_file(self):
-        file_path = filedialog.askopenfilename()
-        if file_path:
-            # Create an "uploads" folder in your BASE_DIR if it doesn't exist.
-            uploads_dir = os.path.join(BASE_DIR, "uploads")
-            os.makedirs(uploads_dir, exist_ok=True)
-            
-            # Copy the selected file into the uploads folder.
-            import shutil
-            dest_path = os.path.join(uploads_dir, os.path.basename(file_path))
-            shutil.copy(file_path, dest_path)
-            
-            # Store the relative path (or absolute if you prefer) of the uploaded file.
-            relative_path = os.path.relpath(dest_path, BASE_DIR)
-            
-            # Add the filename (or path) to the file list widget for display.
-            self.file_list.insert(END, os.path.basename(dest_path))
-            
-            # Keep a list of the stored file paths for use when submitting.
-            if not hasattr(self, "uploaded_files"):
-                self.uploaded_files = []
-            self.uploaded_files.append(relative_path)
+        file_paths = filedialog.askopenfilenames()
+        if not file_paths:
+            return
+        if not hasattr(self, "uploaded_files"):
+            self.uploaded_files = []
+
+        # Copy the files into the document store in the background; identical
+        # files are only kept once. The id is handed out back on the Tk thread.
+        def uploaded(name, stored):
+            digest, size = stored
+            self.uploaded_files.append(documents.register_document(digest, name, size))
+            # Add the filename to the file list widget for display.
+            self.file_list.insert(END, name)
+
+        def finished():
+            self.pending_uploads -= len(file_paths)
+
+        self.pending_uploads += len(file_paths)
+        self.run_transfers("Uploading", [(os.path.basename(path),
+                                          lambda progress, cancelled, path=path: documents.store_blob(path, progress, cancelled))
+                                         for path in file_paths], uploaded, finished)
 
     def view_aid_requests(self):
         request_id = self.request_id_entry.get().strip() 
@@ -1026,14 +1148,14 @@ class UniversityAidApp:
         if request_id in aid_requests:
             request = aid_requests[request_id]
             self.details_text.set(
-                f"Username: {request['username']}\n"
-                f"Aid Type: {request['aid_type']}\n"
-                f"Status: {request['status']}\n"
-                f"Description: {request['description']}"
+                f"Username: {request.username}\n"
+                f"Aid Type: {request.aid_type}\n"
+                f"Status: {request.status}\n"
+                f"Description: {request.description}"
             )
             self.doc_list.delete(0, END)
-            for doc in request['documents']:
-                self.doc_list.insert(END, os.path.basename(doc))
+            for doc in request.documents:
+                self.doc_list.insert(END, documents.display_name(doc))
 
         else:
             messagebox.showerror("Error", "Request ID not found!")
@@ -1118,12 +1240,13 @@ class UniversityAidApp:
 
     def show_user_details(self):
         if self.username and self.username in users_dict:
+            self.get_frame("user_details")
             user = users_dict[self.username]
-            self.details_labels["username"].config(text=f"Username: {user.get('username', 'N/A')}")
-            self.details_labels["password"].config(text=f"Password: {user.get('password', 'N/A')}")
-            self.details_labels["balance"].config(text=f"Balance: RM {user.get('balance', 'Not Provided')}")
-            self.details_labels["phonenumber"].config(text=f"Telephone number:\n{user.get('phonenumber', 'Not Provided')}")
-            self.details_labels["address"].config(text=f"Address: {user.get('address', 'Not Provided')}")
+            self.details_labels["username"].config(text=f"Username: {user.username}")
+            self.details_labels["password"].config(text=f"Password: {user.password}")
+            self.details_labels["balance"].config(text=f"Balance: RM {user.balance}")
+            self.details_labels["phonenumber"].config(text=f"Telephone number:\n{user.phonenumber}")
+            self.details_labels["address"].config(text=f"Address: {user.address}")
             self.show_frame("user_details")
         else:
             messagebox.showwarning("Error", "User details not found!")
@@ -1145,7 +1268,7 @@ class UniversityAidApp:
             entry = Entry(field_frame, font=("Calibri", 14), width=50, bd=0, bg="#D3D3D3")
             entry.pack(fill="x", pady=5)
             if self.username and self.username in users_dict:
-                entry.insert(0, users_dict[self.username].get(field_name, ""))
+                entry.insert(0, getattr(users_dict[self.username], field_name, ""))
             self.user_update_entries[field_name] = entry
             return entry
 
@@ -1165,18 +1288,13 @@ class UniversityAidApp:
             if not self.username or self.username not in users_dict:
                 messagebox.showerror("Error", "User data not found! Ensure you're logged in.")
                 return
-            users_dict[self.username] = {
-                "username": username,
-                "password": password,
-                "balance": users_dict[self.username]["balance"],
-                "address": address,
-                "phonenumber": phone
-            }
-            with open(USER_FILE_PATH, "w") as file:
-                for u_id, user in users_dict.items():
-                    file.write(f"{u_id}:{user.get('username', 'N/A')}:{user.get('password', 'N/A')}:{user.get('balance', 'Not Provided')}|{user.get('address', 'Not Provided')}|{user.get('phonenumber', 'Not Provided')}\n")
+            if storage.username_taken(username, self.username):
+                messagebox.showwarning("Error", "Username already taken. Choose another.")
+                return
+            storage.update_user(self.username, User(username, password, users_dict[self.username].balance, address, phone))
             messagebox.showinfo("Success", "User details updated successfully!")
             clear_entries()
+            self.notify_change("user_updated")
             self.show_user_details()
 
         def clear_entries():
@@ -1218,6 +1336,67 @@ class UniversityAidApp:
         container = Frame(frame, bg="white")
         container.pack(pady=20, padx=40, fill="both", expand=True)
 
+        # Work queue: pending requests for this officer's department, oldest first
+        department = guidance_dict[self.username].department if self.username in guidance_dict else ""
+        queue_frame = Frame(container, bg="#D3D3D3", padx=10, pady=10)
+        queue_frame.pack(pady=5, fill="x")
+        queue_label = Label(queue_frame, text="", font=("Calibri", 14), bg="#D3D3D3", anchor="w")
+        queue_label.pack(fill="x")
+        # Ctrl/Shift-click to select several requests for a bulk decision
+        queue_list = Listbox(queue_frame, height=QUEUE_PAGE_SIZE, font=("Calibri", 12), selectmode=EXTENDED)
+        queue_list.pack(fill="x", pady=5)
+        page = {"start": 0, "ids": []}
+
+        def show_queue_page():
+            total = request_queues.count(department, "Pending")
+            # Step back if the last page emptied out
+            while page["start"] and page["start"] >= total:
+                page["start"] -= QUEUE_PAGE_SIZE
+            page["ids"] = request_queues.page(department, "Pending", page["start"], QUEUE_PAGE_SIZE)
+            queue_list.delete(0, END)
+            if page["ids"]:
+                queue_list.insert(END, *[f"{request_id} - {aid_requests[request_id].username}" for request_id in page["ids"]])
+            pages = max(1, -(-total // QUEUE_PAGE_SIZE))
+            queue_label.config(text=f"Pending {department} requests: {total}   (page {page['start'] // QUEUE_PAGE_SIZE + 1} of {pages})")
+
+        def move_page(step):
+            start = page["start"] + step * QUEUE_PAGE_SIZE
+            if 0 <= start < request_queues.count(department, "Pending"):
+                page["start"] = start
+                show_queue_page()
+
+        def open_selected(event):
+            selection = queue_list.curselection()
+            if len(selection) == 1:
+                self.guidance_request_id_entry.delete(0, END)
+                self.guidance_request_id_entry.insert(0, page["ids"][selection[0]])
+                self.guidance_view_aid_requests()
+
+        def decide_selected(status):
+            request_ids = [page["ids"][index] for index in queue_list.curselection()]
+            if not request_ids:
+                messagebox.showerror("Error", "Select one or more requests first!")
+                return
+            # The list showed the current versions, so reject any decided elsewhere since
+            self.decide_requests([(request_id, status, aid_requests[request_id].version) for request_id in request_ids])
+
+        queue_buttons = Frame(queue_frame, bg="#D3D3D3")
+        queue_buttons.pack(fill="x")
+        Button(queue_buttons, text="< Previous", font=("Calibri", 12), command=lambda: move_page(-1)).pack(side="left")
+        Button(queue_buttons, text="Accept Selected", font=("Calibri", 12), bg="green", fg="white",
+               command=lambda: decide_selected("Accepted")).pack(side="left", padx=5)
+        Button(queue_buttons, text="Decline Selected", font=("Calibri", 12), bg="red", fg="white",
+               command=lambda: decide_selected("Declined")).pack(side="left", padx=5)
+        Button(queue_buttons, text="Import CSV", font=("Calibri", 12), command=self.import_decisions_csv).pack(side="left", padx=5)
+        Button(queue_buttons, text="Next >", font=("Calibri", 12), command=lambda: move_page(1)).pack(side="right")
+        queue_list.bind("<<ListboxSelect>>", open_selected)
+
+        def on_request_change(event, request_id):
+            if event in ("reloaded", "batch") or aid_requests[request_id].aid_type == department:
+                show_queue_page()
+        storage.subscribe_requests(on_request_change)
+        frame.bind("<Destroy>", lambda e: storage.unsubscribe_requests(on_request_change))
+
         # Request ID Entry
         request_id_frame = Frame(container, bg="#D3D3D3", padx=10, pady=10)
         request_id_frame.pack(pady=5, fill="x")
@@ -1246,7 +1425,7 @@ class UniversityAidApp:
         documents_frame = Frame(container, bg="#D3D3D3", padx=10, pady=10)
         documents_frame.pack(pady=5, fill="x")
         Label(documents_frame, text="Documents:", font=("Calibri", 14), bg="#D3D3D3").pack(side="left", pady=5)
-        self.guidance_doc_list = Listbox(documents_frame, height=3, font=("Calibri", 14), bg="#D3D3D3")
+        self.guidance_doc_list = Listbox(documents_frame, height=3, font=("Calibri", 14), bg="#D3D3D3", selectmode=EXTENDED)
         self.guidance_doc_list.pack(side="left", pady=5)
 
 
@@ -1254,27 +1433,88 @@ class UniversityAidApp:
         Button(container, text="Back", font=("Calibri", 14), bg="#e60000", fg="white", command=lambda: self.show_frame("guidance")).pack(pady=5)
 
         self.frames["guidance_view_aid"] = frame
+        show_queue_page()
+
+    # Apply a decision only if the request hasn't changed since the officer
+    # viewed it; another officer may have decided it from a different window.
+    def decide_request(self, request_id, status):
+        viewed_id, viewed_version = self.viewed_request
+        try:
+            set_aid_request_status(request_id, status, viewed_version if viewed_id == request_id else None)
+        except storage.StaleRecordError:
+            messagebox.showwarning("Request Changed", f"Request {request_id} was updated by someone else. Please check it again.")
+            self.guidance_view_aid_requests()
+            return False
+        return True
+
+    # Apply a batch of (request id, status, expected version) decisions in one
+    # write, then report what happened to each, in the order given.
+    def decide_requests(self, decisions):
+        storage.sync_aid_requests()
+        department = guidance_dict[self.username].department
+        # Indexes of the decisions passed on to storage
+        allowed = []
+        results = [None] * len(decisions)
+        for index, (request_id, status, expected_version) in enumerate(decisions):
+            if request_id in aid_requests and aid_requests[request_id].aid_type != department:
+                results[index] = "Not in your department"
+            elif status not in ("Accepted", "Declined"):
+                results[index] = f"Unknown decision '{status}'"
+            else:
+                allowed.append(index)
+        for index, result in zip(allowed, storage.set_aid_request_statuses([decisions[index] for index in allowed])):
+            results[index] = result
+
+        done = [result for result in results if result in ("Accepted", "Declined")]
+        skipped = [f"{request_id}: {result}" for (request_id, status, expected_version), result in zip(decisions, results)
+                   if result not in ("Accepted", "Declined")]
+        summary = f"{len(done)} request(s) decided, {len(skipped)} skipped."
+        if skipped:
+            summary += "\n\n" + "\n".join(skipped[:20])
+            if len(skipped) > 20:
+                summary += f"\n... and {len(skipped) - 20} more"
+        messagebox.showinfo("Bulk Decision", summary)
+
+    # CSV rows of "request_id,decision", e.g. "AID0012,Accepted"; a header row is skipped
+    def import_decisions_csv(self):
+        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not file_path:
+            return
+        decisions = []
+        try:
+            with open(file_path, newline="") as file:
+                for row in csv.reader(file):
+                    if len(row) < 2 or row[0].strip().lower() in ("", "request_id"):
+                        continue
+                    decisions.append((row[0].strip(), row[1].strip().capitalize(), None))
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", f"Could not read {file_path}: {e}")
+            return
+        if not decisions:
+            messagebox.showerror("Error", "No decisions found in the file!")
+            return
+        self.decide_requests(decisions)
 
     def accept_request(self):
         request_id = self.guidance_request_id_entry.get().strip()
+        storage.sync_aid_requests()
 
         if request_id in aid_requests:
             # Get the department of the logged-in guidance user
-            guidance_department = guidance_dict[self.username]["department"]
+            guidance_department = guidance_dict[self.username].department
             
             # Get the department of the aid request
-            request_department = aid_requests[request_id]["aid_type"]  # assuming the 'aid_type' corresponds to the department
+            request_department = aid_requests[request_id].aid_type  # assuming the 'aid_type' corresponds to the department
             
             # Check if the departments match
             if guidance_department == request_department:
-                aid_requests[request_id]["status"] = "Accepted"
-                self.update_aid_requests_file()
+                if not self.decide_request(request_id, "Accepted"):
+                    return
                 messagebox.showinfo("Success", f"Request {request_id} has been accepted.")
                 
                 # Refresh the guidance details label to show the new status.
+                # The report screens pick the change up from the storage events.
                 self.guidance_view_aid_requests()
-                # Optionally, refresh any report frames if necessary:
-                self.refresh_report_frames()
 
                 # Make the success message disappear after 2 seconds (2000 ms)
                 self.after(2000, lambda: messagebox.showinfo("Success", "Request has been accepted!"))
@@ -1292,23 +1532,23 @@ class UniversityAidApp:
 
     def decline_request(self):
         request_id = self.guidance_request_id_entry.get().strip()
+        storage.sync_aid_requests()
 
         if request_id in aid_requests:
             # Get the department of the logged-in guidance user
-            guidance_department = guidance_dict[self.username]["department"]
+            guidance_department = guidance_dict[self.username].department
             
             # Get the department of the aid request
-            request_department = aid_requests[request_id]["aid_type"]  # assuming the 'aid_type' corresponds to the department
+            request_department = aid_requests[request_id].aid_type  # assuming the 'aid_type' corresponds to the department
             
             # Check if the departments match
             if guidance_department == request_department:
-                aid_requests[request_id]["status"] = "Declined"
-                self.update_aid_requests_file()
+                if not self.decide_request(request_id, "Declined"):
+                    return
                 
                 # Refresh the guidance details label to show the new status.
+                # The report screens pick the change up from the storage events.
                 self.guidance_view_aid_requests()
-                # Optionally, refresh any report frames if necessary:
-                self.refresh_report_frames()
                 messagebox.showinfo("Success", f"Request {request_id} has been declined.")
             else:
                 # Pop-up error message if departments don't match
@@ -1323,60 +1563,70 @@ class UniversityAidApp:
         if not selected_index:
             messagebox.showerror("Error", "No file selected!")
             return
-        # Get the displayed filename from the listbox.
-        filename = self.guidance_doc_list.get(selected_index)
-        
         # Get the current aid request ID.
         request_id = self.guidance_request_id_entry.get().strip()
         if request_id not in aid_requests:
             messagebox.showerror("Error", "Aid Request not found!")
             return
         
-        # Find the stored file path that corresponds to the selected filename.
-        file_path = None
-        for doc in aid_requests[request_id]['documents']:
-            if os.path.basename(doc) == filename:
-                file_path = os.path.join(BASE_DIR, doc)  # Build absolute path
-                break
-                
-        if not file_path or not os.path.exists(file_path):
-            messagebox.showerror("Error", "File not found on disk!")
-            return
+        # The list shows the request's documents in order, so the selected rows are the documents
+        request_documents = aid_requests[request_id].documents
+        files = []
+        for index in selected_index:
+            file_path = documents.resolve_path(request_documents[index]) if index < len(request_documents) else None
+            if not file_path:
+                messagebox.showerror("Error", "File not found on disk!")
+                return
+            files.append((documents.display_name(request_documents[index]), file_path))
         
-        # Ask the user where to save (download) the file.
-        dest = filedialog.asksaveasfilename(initialfile=filename, defaultextension=os.path.splitext(filename)[1])
-        if dest:
-            import shutil
-            shutil.copy(file_path, dest)
-            messagebox.showinfo("Success", f"File downloaded to:\n{dest}")
-
-    def update_aid_requests_file(self):
-        with open(AID_REQUESTS_FILE, "w") as file:
-            formatted_requests = []
-            for req_id, details in aid_requests.items():
-                formatted_requests.append({
-                    "request_id": req_id,
-                    "username": details["username"],
-                    "aid_type": details["aid_type"],
-                    "description": details["description"],
-                    "documents": details["documents"],
-                    "status": details["status"]
-                })
-            json.dump(formatted_requests, file, indent=4)
+        # Ask the user where to save (download) the file, or the folder for several.
+        if len(files) == 1:
+            filename = files[0][0]
+            dest = filedialog.asksaveasfilename(initialfile=filename, defaultextension=os.path.splitext(filename)[1])
+            if not dest:
+                return
+            targets = [(filename, files[0][1], dest)]
+        else:
+            folder = filedialog.askdirectory()
+            if not folder:
+                return
+            targets = []
+            used = set()
+            for filename, file_path in files:
+                # Two documents can share a name; number the later ones
+                base, ext = os.path.splitext(filename)
+                name, n = filename, 1
+                while name in used:
+                    n += 1
+                    name = f"{base} ({n}){ext}"
+                used.add(name)
+                targets.append((name, file_path, os.path.join(folder, name)))
+
+        downloaded = []
+        def finished():
+            if downloaded:
+                messagebox.showinfo("Success", "File downloaded to:\n" + "\n".join(downloaded))
+
+        self.run_transfers("Downloading", [(name, lambda progress, cancelled, src=file_path, dest=dest:
+                                            documents.copy_file(src, dest, progress, cancelled) or dest)
+                                           for name, file_path, dest in targets],
+                           lambda name, dest: downloaded.append(dest), finished)
 
     def guidance_view_aid_requests(self):
         request_id = self.guidance_request_id_entry.get().strip()
+        storage.sync_aid_requests()
         if request_id in aid_requests:
             request = aid_requests[request_id]
+            self.viewed_request = (request_id, request.version)
             self.guidance_details_text.set(
-                f"Username: {request['username']}\n"
-                f"Aid Type: {request['aid_type']}\n"
-                f"Status: {request['status']}\n"
-                f"Description: {request['description']}"
+                f"Username: {request.username}\n"
+                f"Aid Type: {request.aid_type}\n"
+                f"Status: {request.status}\n"
+                f"Description: {request.description}"
             )
             self.guidance_doc_list.delete(0, END)
-            for doc in request['documents']:
-                self.guidance_doc_list.insert(END, os.path.basename(doc))
+            for doc in request.documents:
+                self.guidance_doc_list.insert(END, documents.display_name(doc))
 
         else:
             messagebox.showerror("Error", "Request ID not found!")
@@ -1389,32 +1639,31 @@ class UniversityAidApp:
         
         container = Frame(frame, bg="white")
         container.pack(pady=20, padx=40, fill="both", expand=True)
-        self.guidance_details_labels = {}
-        self.guidance_details_labels["username"] = Label(container, text="Username: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=50, height=2)
-        self.guidance_details_labels["username"].pack(pady=10, padx=10, fill="x")
-        self.guidance_details_labels["password"] = Label(container, text="Password: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=50, height=2)
-        self.guidance_details_labels["password"].pack(pady=10, padx=10, fill="x")
+        self.guidance_user_details_labels = {}
+        self.guidance_user_details_labels["username"] = Label(container, text="Username: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=50, height=2)
+        self.guidance_user_details_labels["username"].pack(pady=10, padx=10, fill="x")
+        self.guidance_user_details_labels["password"] = Label(container, text="Password: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=50, height=2)
+        self.guidance_user_details_labels["password"].pack(pady=10, padx=10, fill="x")
         row1 = Frame(container, bg="white")
         row1.pack(pady=5, padx=10, fill="x")
-        self.guidance_details_labels["balance"] = Label(row1, text="Balance: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=25, height=4)
-        self.guidance_details_labels["balance"].pack(side="left", padx=5, expand=True, fill="both")
-        self.guidance_details_labels["phonenumber"] = Label(row1, text="Telephone number:", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=25, height=4)
-        self.guidance_details_labels["phonenumber"].pack(side="right", padx=5, expand=True, fill="both")
-        self.guidance_details_labels["address"] = Label(container, text="Address: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=50, height=4)
-        self.guidance_details_labels["address"].pack(pady=10, padx=10, fill="x")
+        self.guidance_user_details_labels["balance"] = Label(row1, text="Balance: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=25, height=4)
+        self.guidance_user_details_labels["balance"].pack(side="left", padx=5, expand=True, fill="both")
+        self.guidance_user_details_labels["phonenumber"] = Label(row1, text="Telephone number:", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=25, height=4)
+        self.guidance_user_details_labels["phonenumber"].pack(side="right", padx=5, expand=True, fill="both")
+        self.guidance_user_details_labels["address"] = Label(container, text="Address: ", font=("Calibri", 14, "bold"), bg="#D3D3D3", fg="black", anchor="w", padx=10, width=50, height=4)
+        self.guidance_user_details_labels["address"].pack(pady=10, padx=10, fill="x")
         Button(container, text="🔙 Back", font=("Calibri", 14), bg="#e60000", fg="white", width=20, command=lambda: self.show_frame("check_user_details_guidance")).pack(pady=20)
         self.frames["user_details_guidance"] = frame
 
     def show_user_details_guidance(self, user_id):
-        if "balance" not in self.guidance_details_labels:
-            self.create_guidance_user_details_frame()
         if user_id in users_dict:
+            self.get_frame("user_details_guidance")
             user = users_dict[user_id]
-            self.guidance_details_labels["username"].config(text=f"Username: {user.get('username', 'N/A')}")
-            self.guidance_details_labels["password"].config(text=f"Password: {user.get('password', 'N/A')}")
-            self.guidance_details_labels["balance"].config(text=f"Balance: RM {user.get('balance', 'Not Provided')}")
-            self.guidance_details_labels["phonenumber"].config(text=f"Telephone number: {user.get('phonenumber', 'Not Provided')}")
-            self.guidance_details_labels["address"].config(text=f"Address: {user.get('address', 'Not Provided')}")
+            self.guidance_user_details_labels["username"].config(text=f"Username: {user.username}")
+            self.guidance_user_details_labels["password"].config(text=f"Password: {user.password}")
+            self.guidance_user_details_labels["balance"].config(text=f"Balance: RM {user.balance}")
+            self.guidance_user_details_labels["phonenumber"].config(text=f"Telephone number: {user.phonenumber}")
+            self.guidance_user_details_labels["address"].config(text=f"Address: {user.address}")
             self.show_frame("user_details_guidance")
         else:
             messagebox.showwarning("Error", "User details not found!")
@@ -1431,19 +1680,10 @@ class UniversityAidApp:
         name_list = Listbox(frame, width=50)
         name_list.pack(pady=10)
 
-        def update(data=None):
-            name_list.delete(0, END)
-            for item in (data or users_dict.keys()):
-                name_list.insert(END, item)
-
         def fillblank(event):
             name_entry.delete(0, END)
             name_entry.insert(0, name_list.get(ACTIVE))
 
-        def check(event):
-            typed = name_entry.get().strip().lower()
-            update([user_id for user_id in users_dict if typed in user_id.lower()])
-
         def view_user_details():
             selected_user = name_list.get(ACTIVE)
             if selected_user in users_dict:
@@ -1454,8 +1694,7 @@ class UniversityAidApp:
         Button(frame, text="View Details", font=("Calibri", 14), bg="#0073e6", fg="white", command=view_user_details).pack(pady=10)
         Button(frame, text="Back", font=("Calibri", 14), bg="#e60000", fg="white", command=lambda: self.show_frame("guidance")).pack(pady=5)
         name_list.bind("<<ListboxSelect>>", fillblank)
-        name_entry.bind("<KeyRelease>", check)
-        update()
+        self.attach_user_search(name_entry, name_list)
         self.frames["check_user_details_guidance"] = frame
 
     def create_guidance_details_frame(self):
@@ -1480,14 +1719,13 @@ class UniversityAidApp:
         self.frames["guidance_details"] = frame
 
     def show_guidance_details(self):
-        if not self.guidance_details_labels or "department" not in self.guidance_details_labels:
-            self.create_guidance_details_frame()
         if self.username and self.username in guidance_dict:
+            self.get_frame("guidance_details")
             user_data = guidance_dict[self.username]
-            guidance_phone = user_data.get("phonenumber", "Not Available")
-            guidance_department = user_data.get("department", "Not Available")
-            self.guidance_details_labels["username"].config(text=f"Username: {user_data.get('username', 'N/A')}")
-            self.guidance_details_labels["password"].config(text=f"Password: {user_data.get('password', 'N/A')}")
+            guidance_phone = user_data.phonenumber
+            guidance_department = user_data.department
+            self.guidance_details_labels["username"].config(text=f"Username: {user_data.username}")
+            self.guidance_details_labels["password"].config(text=f"Password: {user_data.password}")
             self.guidance_details_labels["phonenumber"].config(text=f"Phone Number: {guidance_phone}")
             self.guidance_details_labels["department"].config(text=f"Department: {guidance_department}")
             self.show_frame("guidance_details")
@@ -1523,7 +1761,7 @@ class UniversityAidApp:
                 entry = Entry(field_frame, font=("Calibri", 14), width=50, bd=0, bg="#D3D3D3")
                 entry.pack(fill="x", pady=5)
                 if self.username in guidance_dict:
-                    entry.insert(0, guidance_dict[self.username].get(field_name, ""))
+                    entry.insert(0, getattr(guidance_dict[self.username], field_name, ""))
                 self.guidance_update_entries[field_name] = entry
 
         create_update_entry("Username:", "username")
@@ -1552,19 +1790,10 @@ class UniversityAidApp:
             if self.username not in guidance_dict:
                 messagebox.showerror("Error", "Could not find user data!")
                 return
-            guidance_dict[new_username] = {
-                "username": new_username,
-                "password": new_password,
-                "phonenumber": new_phonenumber,
-                "department": new_department
-            }
-            if new_username != self.username:
-                del guidance_dict[self.username]
-            with open(GUIDANCE_FILE_PATH, "w") as file:
-                for user_id, user_data in guidance_dict.items():
-                    file.write(f"{user_data['username']}:{user_data['password']}:{user_data['phonenumber']}:{user_data['department']}\n")
+            storage.update_guidance(self.username, GuidanceOfficer(new_username, new_password, new_phonenumber, new_department))
             messagebox.showinfo("Success", "Details updated successfully!")
             clear_entries()
+            self.notify_change("guidance_updated")
             self.username = new_username
             self.show_guidance_details()
 
@@ -1614,22 +1843,11 @@ class UniversityAidApp:
         name_entry.focus()
         name_list = Listbox(frame, width=50)
         name_list.pack(pady=10)
-        def update(data=None):
-            name_list.delete(0, END)
-            if data is None:
-                data = list(users_dict.keys())
-            for item in data:
-                display_text = f"{users_dict[item]['username']} - {item}"
-                name_list.insert(END, display_text)
         def fillblank(event):
             selected = name_list.get(ACTIVE)
             user_id = selected.split(" - ")[1]
             name_entry.delete(0, END)
             name_entry.insert(0, user_id)
-        def check(event):
-            typed = name_entry.get().strip().lower()
-            data = [user_id for user_id in users_dict if typed in user_id.lower() or typed in users_dict[user_id]['username'].lower()]
-            update(data)
         def view_user_details():
             selected = name_list.get(ACTIVE)
             if selected:
@@ -1643,8 +1861,7 @@ class UniversityAidApp:
         Button(frame, text="View Details", font=("Calibri", 14), bg="#0073e6", fg="white", command=view_user_details).pack(pady=10)
         Button(frame, text="Back", font=("Calibri", 14), bg="#e60000", fg="white", command=lambda: self.show_frame("headminister")).pack(pady=5)
         name_list.bind("<<ListboxSelect>>", fillblank)
-        name_entry.bind("<KeyRelease>", check)
-        update()
+        self.attach_user_search(name_entry, name_list, lambda user_id: f"{users_dict[user_id].username} - {user_id}")
         self.frames["check_user_details_headminister"] = frame
 
     def create_headminister_user_details_frame(self):
@@ -1673,12 +1890,13 @@ class UniversityAidApp:
 
     def show_user_details_headminister(self, user_id):
         self.selected_user_id = user_id
+        self.get_frame("user_details_headminister")
         user = users_dict[user_id]
-        self.headminister_details_labels["username"].config(text=f"Username: {user.get('username', 'N/A')}")
-        self.headminister_details_labels["password"].config(text=f"Password: {user.get('password', 'N/A')}")
-        self.headminister_details_labels["balance"].config(text=f"Balance: RM {user.get('balance', 'Not Provided')}")
-        self.headminister_details_labels["phonenumber"].config(text=f"Telephone number:\n{user.get('phonenumber', 'Not Provided')}")
-        self.headminister_details_labels["address"].config(text=f"Address: {user.get('address', 'Not Provided')}")
+        self.headminister_details_labels["username"].config(text=f"Username: {user.username}")
+        self.headminister_details_labels["password"].config(text=f"Password: {user.password}")
+        self.headminister_details_labels["balance"].config(text=f"Balance: RM {user.balance}")
+        self.headminister_details_labels["phonenumber"].config(text=f"Telephone number:\n{user.phonenumber}")
+        self.headminister_details_labels["address"].config(text=f"Address: {user.address}")
         self.show_frame("user_details_headminister")
 
     def create_headminister_update_user_details_frame(self):
@@ -1718,24 +1936,13 @@ class UniversityAidApp:
             if not username or not password:
                 messagebox.showwarning("Error", "Username and Password must be filled!")
                 return
-            users_dict[self.selected_user_id] = {
-                "username": username,
-                "password": password,
-                "balance": users_dict[self.selected_user_id]["balance"],
-                "address": address,
-                "phonenumber": phone
-            }
-            with open(USER_FILE_PATH, "w") as file:
-                for u_id, user in users_dict.items():
-                    file.write(f"{u_id}:{user.get('username', 'N/A')}:{user.get('password', 'N/A')}:{user.get('balance', 'Not Provided')}|{user.get('address', 'Not Provided')}|{user.get('phonenumber', 'Not Provided')}\n")
+            if storage.username_taken(username, self.selected_user_id):
+                messagebox.showwarning("Error", "Username already taken. Choose another.")
+                return
+            storage.update_user(self.selected_user_id, User(username, password, users_dict[self.selected_user_id].balance, address, phone))
             messagebox.showinfo("Success", "User details updated successfully!")
             clear_entries()
-            self.frames["headminister"].destroy()
-            self.frames["check_user_details_headminister"].destroy()
-            self.frames["user_details_headminister"].destroy()
-            self.create_headminister_frame()
-            self.create_select_user_for_details_headminister_frame()
-            self.create_headminister_user_details_frame()
+            self.notify_change("user_updated")
             self.show_user_details_headminister(self.selected_user_id)
 
         def back_and_clear():
@@ -1754,6 +1961,7 @@ class UniversityAidApp:
         title_bar.pack(fill="x")
         Label(title_bar, text="Manage User Accounts", font=("Comic Sans MS", 20, "bold"), bg="darkblue", fg="white").pack(pady=10)
         Button(frame, text="➕ Add User", font=("Calibri", 14), bg="#0073e6", fg="white", width=20, command=lambda: self.show_frame("headminister_add_user")).pack(pady=10)
+        Button(frame, text="Import Students", font=("Calibri", 14), bg="#0073e6", fg="white", width=20, command=self.import_students).pack(pady=10)
         Button(frame, text="🗑 Delete User", font=("Calibri", 14), bg="#e60000", fg="white", width=20, command=lambda: self.show_frame("headminister_delete_user")).pack(pady=10)
         Button(frame, text="🔙 Back", font=("Calibri", 14), bg="#e60000", fg="white", width=20, command=lambda: self.show_frame("headminister")).pack(pady=10)
         self.frames["headminister_manage_account"] = frame
@@ -1784,28 +1992,13 @@ class UniversityAidApp:
                 add_notif.config(text="Please fill in all fields.", fg="red")
             elif user_id in users_dict:
                 add_notif.config(text="User ID already exists. Please choose a different ID.", fg="red")
+            elif storage.username_taken(newuser_username):
+                add_notif.config(text="Username already taken. Choose another.", fg="red")
             else:
-                users_dict[user_id] = {
-                    "username": newuser_username,
-                    "password": newuser_password,
-                    "balance": 0,
-                    "address": "Not Provided",
-                    "phonenumber": "Not Provided"
-                }
-                with open(USER_FILE_PATH, 'a') as file:
-                    file.write(f"{user_id}:{newuser_username}:{newuser_password}:0.0|Not Provided|Not Provided\n")
+                storage.add_user(user_id, User(newuser_username, newuser_password, 0, "Not Provided", "Not Provided"))
                 add_notif.config(text="User added successfully!", fg="green")
                 frame.after(3000, lambda: add_notif.config(text=""))
-                self.refresh_frames()
-                self.frames["admin_delete_user"].destroy()
-                self.create_admin_delete_user_frame()
-                self.frames["headminister_delete_user"].destroy()
-                self.create_headminister_delete_user_frame()
-                self.frames["check_user_details_headminister"].destroy()
-                self.frames["user_details_headminister"].destroy()
-                self.create_headminister_frame()
-                self.create_select_user_for_details_headminister_frame()
-                self.create_headminister_user_details_frame()
+                self.notify_change("user_added")
                 new_user_id_input.delete(0, END)
                 new_username_input.delete(0, END)
                 new_password_input.delete(0, END)
@@ -1828,25 +2021,10 @@ class UniversityAidApp:
         delete_notif = Label(frame, text="", font=("Calibri", 12), bg="#f4f4f9", fg="red")
         delete_notif.pack(pady=10)
 
-        def update(data=None):
-            name_list.delete(0, END)
-            if data is None:
-                data = list(users_dict.keys())
-            for item in data:
-                name_list.insert(END, item)
-
         def fillblank(event):
             name_entry.delete(0, END)
             name_entry.insert(0, name_list.get(ACTIVE))
 
-        def check(event):
-            typed = name_entry.get()
-            if typed == "":
-                data = list(users_dict.keys())
-            else:
-                data = [item for item in users_dict.keys() if typed.lower() in item.lower()]
-            update(data)
-
         def delete_user():
             selected_user = name_list.get(ACTIVE)
             if not selected_user:
@@ -1856,34 +2034,86 @@ class UniversityAidApp:
             if not confirm:
                 return
             if selected_user in users_dict:
-                del users_dict[selected_user]
-                with open(USER_FILE_PATH, "w") as file:
-                    for user_id, user in users_dict.items():
-                        file.write(f"{user_id}:{user.get('username', 'N/A')}:{user.get('password', 'N/A')}:{user.get('balance', 'Not Provided')}|{user.get('address', 'Not Provided')}|{user.get('phonenumber', 'Not Provided')}\n")
+                storage.delete_user(selected_user)
                 delete_notif.config(text="User deleted successfully!", fg="green")
                 frame.after(3000, lambda: delete_notif.config(text=""))
-                update()
-                self.refresh_frames()
-                self.frames["admin_delete_user"].destroy()
-                self.create_admin_delete_user_frame()
+                name_entry.delete(0, END)
+                refresh_search()
+                self.notify_change("user_deleted")
             else:
                 delete_notif.config(text="User not found!", fg="red")
 
         Button(frame, text="Delete", font=("Calibri", 14), bg="#e60000", fg="white", command=delete_user).pack(pady=10)
         Button(frame, text="Back", font=("Calibri", 14), bg="#0073e6", fg="white", command=lambda: self.show_frame("headminister_manage_account")).pack(pady=5)
         name_list.bind("<<ListboxSelect>>", fillblank)
-        name_entry.bind("<KeyRelease>", check)
-        update()
+        refresh_search = self.attach_user_search(name_entry, name_list)
         self.frames["headminister_delete_user"] = frame
 
-# Load data
-readadmin()
-readuser()
-readguidance()
-readheadminister()
+# --------------------- STARTUP ---------------------
+# How long each startup phase took, in seconds; printed once the login screen is up
+startup_timings = {}
+# How often the splash screen checks whether the data has finished loading
+LOAD_POLL_MS = 50
+
+def print_startup_timings():
+    print("Startup: " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in startup_timings.items()))
+
+def create_app(root=None):
+    """ Opens the window with a splash screen and loads the data files on a
+    background thread; the app itself is built once loading finishes. Returns
+    the Tk root. """
+    started = time.perf_counter()
+    root = root or Tk()
+    root.title("University Aid System")
+    root.geometry("800x800")
+    root.config(bg="white")
+    splash = Frame(root, bg="white")
+    splash.pack(fill="both", expand=True)
+    Label(splash, text="University Aid System", font=("Calibri", 24, "bold"), bg="white").pack(pady=(300, 10))
+    Label(splash, text="Loading data...", font=("Calibri", 14), bg="white").pack(pady=5)
+    progress_bar = ttk.Progressbar(splash, mode="indeterminate", length=300)
+    progress_bar.pack(pady=10)
+    progress_bar.start(15)
+    startup_timings["window"] = time.perf_counter() - started
+
+    # The GUI doesn't touch the storage dictionaries until the app is built,
+    # so the loader thread has them to itself
+    load_error = []
+
+    def load():
+        load_started = time.perf_counter()
+        try:
+            # The search index too, so the first search screen doesn't stall the window building it
+            storage.load_all(build_search_index=True)
+        except Exception as e:
+            load_error.append(e)
+        startup_timings["load_data"] = time.perf_counter() - load_started
+
+    def wait_for_data():
+        if loader.is_alive():
+            root.after(LOAD_POLL_MS, wait_for_data)
+            return
+        splash.destroy()
+        if load_error:
+            messagebox.showerror("Error", f"Could not load the data files: {load_error[0]}")
+            root.destroy()
+            return
+        build_started = time.perf_counter()
+        root.app = UniversityAidApp(root)
+        startup_timings["build_ui"] = time.perf_counter() - build_started
+        startup_timings["total"] = time.perf_counter() - IMPORT_STARTED
+        print_startup_timings()
+
+    loader = threading.Thread(target=load, daemon=True)
+    loader.start()
+    root.after(LOAD_POLL_MS, wait_for_data)
+    return root
+
+def main():
+    startup_timings["imports"] = time.perf_counter() - IMPORT_STARTED
+    root = create_app()
+    root.mainloop()
 
 
-# Run application
-root = Tk()
-app = UniversityAidApp(root)
-root.mainloop()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+from storage import aid_requests, request_stats
+from documents import display_name
+
+# Report export. The text report is produced as a stream of chunks so it can be
+# written straight to disk: memory stays flat and the cost is linear in the
+# number of requests, however many there are. The PDF export consumes the same
+# stream, wrapping and paginating it as it goes.
+
+# Number of request blocks joined into one chunk before it is yielded
+CHUNK_REQUESTS = 256
+
+def report_header():
+    return (
+        "=== University Aid Requests Report ===\n\n"
+        f"Total Aid Requests: {request_stats.count()}\n"
+        f"Accepted: {request_stats.count('Accepted')}\n"
+        f"Declined: {request_stats.count('Declined')}\n"
+        f"Pending: {request_stats.count('Pending')}\n\n"
+        + "=" * 50 + "\n\n"
+    )
+
+def format_request(req_id, details):
+    documents = ", ".join(map(display_name, details.documents)) if details.documents else "None"
+    return (
+        f"Request ID: {req_id}\n"
+        f"Username: {details.username}\n"
+        f"Aid Type: {details.aid_type}\n"
+        f"Status: {details.status}\n"
+        f"Description: {details.description}\n"
+        f"Documents: {documents}\n"
+        + "-" * 50 + "\n"
+    )
+
+def iter_report_text(progress=None):
+    """ Yields the text report in chunks; progress(done, total) is called after each one. """
+    yield report_header()
+    # Snapshot the ids so requests added while exporting can't break the iteration
+    request_ids = list(aid_requests)
+    total = len(request_ids)
+    parts = []
+    for done, req_id in enumerate(request_ids, 1):
+        details = aid_requests.get(req_id)
+        if details is None:
+            continue
+        parts.append(format_request(req_id, details))
+        if len(parts) >= CHUNK_REQUESTS:
+            yield "".join(parts)
+            parts = []
+            if progress:
+                progress(done, total)
+    if parts:
+        yield "".join(parts)
+    if progress:
+        progress(total, total)
+
+def write_report_text(file_path, progress=None):
+    with open(file_path, "w") as file:
+        for chunk in iter_report_text(progress):
+            file.write(chunk)
+
+
+# --------------------- PDF ---------------------
+PDF_MARGIN = 50
+PDF_FONT = "Helvetica"
+PDF_FONT_SIZE = 10
+PDF_LINE_HEIGHT = 14
+
+class ReportCancelled(Exception):
+    pass
+
+def write_report_pdf(file_path, progress=None, cancelled=None):
+    """ Writes the report as a PDF, one page at a time.
+
+    Long lines are wrapped to the page width. Meant to run on a worker thread:
+    progress(done, total) reports how far along it is, and the export stops with
+    ReportCancelled (removing the partial file) once cancelled() returns True.
+    """
+    # reportlab takes a while to import, so only PDF exports pay for it
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen import canvas
+
+    width, height = letter
+    max_width = width - 2 * PDF_MARGIN
+    lines_per_page = int((height - 2 * PDF_MARGIN) // PDF_LINE_HEIGHT)
+    # Finished pages are compressed straight away, so each page costs a few KB
+    pdf = canvas.Canvas(file_path, pagesize=letter, pageCompression=1)
+
+    def new_page_text():
+        text = pdf.beginText(PDF_MARGIN, height - PDF_MARGIN)
+        text.setFont(PDF_FONT, PDF_FONT_SIZE)
+        text.setLeading(PDF_LINE_HEIGHT)
+        return text
+
+    try:
+        text = new_page_text()
+        lines_on_page = 0
+        for chunk in iter_report_text(progress):
+            for line in chunk.splitlines():
+                # Most lines fit; only measure word by word when one doesn't
+                if stringWidth(line, PDF_FONT, PDF_FONT_SIZE) <= max_width:
+                    wrapped_lines = [line]
+                else:
+                    wrapped_lines = simpleSplit(line, PDF_FONT, PDF_FONT_SIZE, max_width) or [""]
+                for wrapped in wrapped_lines:
+                    if lines_on_page == lines_per_page:
+                        pdf.drawText(text)
+                        pdf.showPage()
+                        if cancelled and cancelled():
+                            raise ReportCancelled()
+                        text = new_page_text()
+                        lines_on_page = 0
+                    text.textLine(wrapped)
+                    lines_on_page += 1
+        pdf.drawText(text)
+        pdf.save()
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
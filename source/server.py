@@ -0,0 +1,350 @@
+"""
+Headless HTTP/JSON service over the same data layer as the GUI.
+
+    python server.py [--host 127.0.0.1] [--port 8080]
+
+POST /login                     {"username", "password"} -> {"token", "role"}
+POST /logout
+POST /requests                  {"aid_type", "description", "documents"?, "username"?} -> {"request_id"}
+                                documents are ids of already uploaded documents
+GET  /requests/<id>
+POST /requests/<id>/decision    {"status": "Accepted" | "Declined", "version"?}
+POST /requests/decisions        {"decisions": [{"request_id", "status", "version"?}, ...]}
+                                -> {"results": [{"request_id", "result"}, ...]}, one per decision, in order
+GET  /report                    summary counts
+GET  /report.txt                the same text as "Save Report", streamed
+GET  /metrics                   write-behind counters and flush latency
+
+Everything but /login needs an "Authorization: Bearer <token>" header.
+All storage calls run on the event loop thread, so the module dictionaries are
+never touched from two places at once.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+from urllib.parse import urlsplit
+
+import storage
+import reports
+import documents
+from storage import admin_dict, users_dict, guidance_dict, headmin_dict, aid_requests, request_stats
+
+# Pick up writes from other instances (GUI or server) this often, in seconds
+SYNC_INTERVAL = 1.0
+# Write out account changes that have sat for storage.WRITE_BEHIND_SECONDS this often
+FLUSH_INTERVAL = 0.2
+MAX_BODY_BYTES = 1024 * 1024
+DECISIONS = ("Accepted", "Declined")
+# The choices on the GUI's request form; each is some department's work queue
+AID_TYPES = ("Hostel", "Counselling", "Finance")
+REPORT_ROLES = ("admin", "headminister")
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+               404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+               500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# token -> {"token", "role", "username"}
+sessions = {}
+
+# Same precedence as the login screen
+def check_login(username, password):
+    if username in admin_dict and admin_dict[username] == password:
+        return "admin"
+    if username in users_dict and users_dict[username].password == password:
+        return "user"
+    if username in guidance_dict and guidance_dict[username].password == password:
+        return "guidance"
+    if username in headmin_dict and headmin_dict[username] == password:
+        return "headminister"
+    return None
+
+# The logged-in account's record. A session whose account was deleted since
+# it logged in is dropped.
+def session_account(session, records):
+    record = records.get(session["username"])
+    if record is None:
+        sessions.pop(session["token"], None)
+        raise HttpError(401, "Log in first")
+    return record
+
+def request_json(request_id):
+    return aid_requests[request_id].to_dict(request_id)
+
+
+# --------------------- HANDLERS ---------------------
+def handle_login(session, body):
+    username = body.get("username")
+    password = body.get("password")
+    if not isinstance(username, str) or not isinstance(password, str):
+        raise HttpError(400, "username and password must be strings")
+    username = username.strip()
+    role = check_login(username, password.strip())
+    if role is None:
+        raise HttpError(401, "Invalid ID or password")
+    token = secrets.token_urlsafe(24)
+    sessions[token] = {"token": token, "role": role, "username": username}
+    return 200, {"token": token, "role": role}
+
+def handle_logout(session, body):
+    sessions.pop(session["token"], None)
+    return 200, {}
+
+def handle_submit(session, body):
+    if session["role"] != "user":
+        raise HttpError(403, "Only students can submit aid requests")
+    user = session_account(session, users_dict)
+    # The form lets the student type the name; default to the account's own
+    name = str(body.get("username") or user.username).strip()
+    aid_type = str(body.get("aid_type", "")).strip()
+    description = str(body.get("description", "")).strip()
+    doc_ids = body.get("documents", [])
+    if not name or not aid_type or not description:
+        raise HttpError(400, "All fields are required!")
+    if aid_type not in AID_TYPES:
+        raise HttpError(400, f"aid_type must be one of {', '.join(AID_TYPES)}")
+    if not isinstance(doc_ids, list):
+        raise HttpError(400, "documents must be a list")
+    # Only ids from the document index; a path here would let an officer's
+    # download copy any file on the machine
+    for doc in doc_ids:
+        if not isinstance(doc, str) or documents.lookup(doc) is None:
+            raise HttpError(400, f"Unknown document: {doc!r}")
+    request_id = storage.allocate_id("aid_request")
+    storage.save_aid_request(request_id, name, aid_type, description, doc_ids)
+    return 201, {"request_id": request_id}
+
+def handle_lookup(session, body, request_id):
+    if request_id not in aid_requests:
+        raise HttpError(404, "Request ID not found!")
+    return 200, request_json(request_id)
+
+def handle_decision(session, body, request_id):
+    if session["role"] != "guidance":
+        raise HttpError(403, "Only guidance officers can decide requests")
+    storage.sync_aid_requests()
+    if request_id not in aid_requests:
+        raise HttpError(404, "Request ID not found!")
+    status = body.get("status")
+    if status not in DECISIONS:
+        raise HttpError(400, "status must be Accepted or Declined")
+    if session_account(session, guidance_dict).department != aid_requests[request_id].aid_type:
+        raise HttpError(403, "You can only decide requests that match your department!")
+    try:
+        storage.set_aid_request_status(request_id, status, body.get("version"))
+    except storage.StaleRecordError as e:
+        raise HttpError(409, str(e))
+    return 200, request_json(request_id)
+
+# Bulk decisions are written in one go; each item gets its own result
+def handle_bulk_decision(session, body):
+    if session["role"] != "guidance":
+        raise HttpError(403, "Only guidance officers can decide requests")
+    items = body.get("decisions")
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise HttpError(400, "decisions must be a list of objects")
+    storage.sync_aid_requests()
+    department = session_account(session, guidance_dict).department
+    request_ids = [str(item.get("request_id", "")) for item in items]
+    results = [None] * len(items)
+    # Indexes of the items passed on to storage
+    allowed = []
+    for index, item in enumerate(items):
+        request_id = request_ids[index]
+        if item.get("status") not in DECISIONS:
+            results[index] = "status must be Accepted or Declined"
+        elif request_id in aid_requests and aid_requests[request_id].aid_type != department:
+            results[index] = "Not in your department"
+        else:
+            allowed.append(index)
+    decided = storage.set_aid_request_statuses([(request_ids[index], items[index]["status"], items[index].get("version"))
+                                                for index in allowed])
+    for index, result in zip(allowed, decided):
+        results[index] = result
+    return 200, {"results": [{"request_id": request_id, "result": result}
+                             for request_id, result in zip(request_ids, results)]}
+
+def handle_report(session, body):
+    if session["role"] not in REPORT_ROLES:
+        raise HttpError(403, "Reports are for admins and headministers")
+    return 200, {
+        "total": request_stats.count(),
+        "by_status": {status: n for status, n in request_stats.by_status.items() if n},
+        "by_aid_type": {aid_type: n for aid_type, n in request_stats.by_aid_type.items() if n},
+    }
+
+def handle_metrics(session, body):
+    if session["role"] not in REPORT_ROLES:
+        raise HttpError(403, "Metrics are for admins and headministers")
+    return 200, {"write_behind": storage.write_behind.stats()}
+
+
+# --------------------- HTTP ---------------------
+async def read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        raise HttpError(400, "Bad Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, urlsplit(target).path, version, headers, body
+
+def encode_response(status, payload, keep_alive):
+    data = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + data
+
+async def stream_report_text(writer, keep_alive):
+    writer.write((f"HTTP/1.1 200 OK\r\n"
+                  f"Content-Type: text/plain; charset=utf-8\r\n"
+                  f"Transfer-Encoding: chunked\r\n"
+                  f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode())
+    for chunk in reports.iter_report_text():
+        data = chunk.encode()
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        # Let other clients in between chunks
+        await writer.drain()
+        await asyncio.sleep(0)
+    writer.write(b"0\r\n\r\n")
+
+def route(method, path):
+    parts = [part for part in path.split("/") if part]
+    if parts == ["login"] and method == "POST":
+        return handle_login, (), False
+    if parts == ["logout"] and method == "POST":
+        return handle_logout, (), True
+    if parts == ["requests"] and method == "POST":
+        return handle_submit, (), True
+    if parts == ["requests", "decisions"] and method == "POST":
+        return handle_bulk_decision, (), True
+    if len(parts) == 2 and parts[0] == "requests" and method == "GET":
+        return handle_lookup, (parts[1],), True
+    if len(parts) == 3 and parts[0] == "requests" and parts[2] == "decision" and method == "POST":
+        return handle_decision, (parts[1],), True
+    if parts == ["report"] and method == "GET":
+        return handle_report, (), True
+    if parts == ["report.txt"] and method == "GET":
+        return "report.txt", (), True
+    if parts == ["metrics"] and method == "GET":
+        return handle_metrics, (), True
+    if parts and parts[0] in ("login", "logout", "requests", "report", "report.txt", "metrics"):
+        raise HttpError(405, "Method not allowed")
+    raise HttpError(404, "Not found")
+
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, version, headers, raw_body = request
+                keep_alive = (headers.get("connection", "").lower() != "close" if version == "HTTP/1.1"
+                              else headers.get("connection", "").lower() == "keep-alive")
+                handler, args, needs_session = route(method, path)
+                session = None
+                if needs_session:
+                    token = headers.get("authorization", "").partition("Bearer ")[2].strip()
+                    session = sessions.get(token)
+                    if session is None:
+                        raise HttpError(401, "Log in first")
+                if handler == "report.txt":
+                    if session["role"] not in REPORT_ROLES:
+                        raise HttpError(403, "Reports are for admins and headministers")
+                    await stream_report_text(writer, keep_alive)
+                else:
+                    try:
+                        body = json.loads(raw_body) if raw_body else {}
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        raise HttpError(400, "Body must be JSON")
+                    if not isinstance(body, dict):
+                        raise HttpError(400, "Body must be a JSON object")
+                    status, payload = handler(session, body, *args)
+                    writer.write(encode_response(status, payload, keep_alive))
+            except HttpError as e:
+                writer.write(encode_response(e.status, {"error": e.message}, keep_alive))
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                # Truncated body or a header line past the stream limit
+                writer.write(encode_response(400, {"error": "Malformed request"}, False))
+                keep_alive = False
+            except Exception as e:
+                print(f"Error handling request: {e}")
+                writer.write(encode_response(500, {"error": "Internal server error"}, False))
+                keep_alive = False
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def sync_periodically():
+    while True:
+        await asyncio.sleep(SYNC_INTERVAL)
+        try:
+            storage.sync_aid_requests()
+        except Exception as e:
+            print(f"Error syncing aid requests: {e}")
+
+async def flush_periodically():
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        try:
+            storage.write_behind.flush()
+        except Exception as e:
+            print(f"Error writing account changes: {e}")
+
+async def serve(host, port):
+    server = await asyncio.start_server(handle_connection, host, port, backlog=512)
+    sync_task = asyncio.create_task(sync_periodically())
+    flush_task = asyncio.create_task(flush_periodically())
+    print(f"Serving on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sync_task.cancel()
+        flush_task.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the aid system as an HTTP/JSON service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    storage.load_all()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
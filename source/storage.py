@@ -0,0 +1,1525 @@
+import os
+import atexit
+import bisect
+import gc
+import io
+import json
+import marshal
+import sqlite3
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager, ExitStack
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Storage layer shared by the GUI. Data lives either in the original text
+# files (users.txt, guidance.txt, aid_requests.txt, ...) or, once migrated, in
+# an indexed SQLite database (aid_system.db). The module-level dictionaries are
+# the in-memory view the GUI reads from; every write goes through the helpers
+# at the bottom of this file so the active backend can persist just that record.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Point AID_DATA_DIR at a shared folder to run several instances on the same data
+DATA_DIR = os.environ.get("AID_DATA_DIR", BASE_DIR)
+
+# Define file paths
+ADMIN_FILE_PATH = os.path.join(DATA_DIR, "admin.txt")
+USER_FILE_PATH = os.path.join(DATA_DIR, "users.txt")
+USER_LOCK_FILE = os.path.join(DATA_DIR, "users.lock")
+GUIDANCE_FILE_PATH = os.path.join(DATA_DIR, "guidance.txt")
+HEADMIN_FILE_PATH = os.path.join(DATA_DIR, "headminister.txt")
+AID_REQUESTS_FILE = os.path.join(DATA_DIR, "aid_requests.txt")
+AID_JOURNAL_FILE = os.path.join(DATA_DIR, "aid_requests.journal")
+AID_JOURNAL_COMPACTING_FILE = AID_JOURNAL_FILE + ".compacting"
+AID_LOCK_FILE = os.path.join(DATA_DIR, "aid_requests.lock")
+DATABASE_FILE = os.path.join(DATA_DIR, "aid_system.db")
+SEQUENCES_FILE = os.path.join(DATA_DIR, "sequences.json")
+SEQUENCES_LOCK_FILE = SEQUENCES_FILE + ".lock"
+STARTUP_CACHE_FILE = os.path.join(DATA_DIR, "startup.cache")
+
+# --------------------- RECORDS ---------------------
+# Users, guidance officers and aid requests are small objects with __slots__
+# rather than a dict each, so a record carries no hash table of repeated keys;
+# at hundreds of thousands of records that overhead was most of the memory.
+# Enum-like values (status, aid type, department) are interned, so every
+# record shares one copy of "Pending", "Finance", ...
+
+class User:
+    __slots__ = ("username", "password", "balance", "address", "phonenumber")
+
+    def __init__(self, username, password, balance=0.0, address="Not Provided", phonenumber="Not Provided"):
+        self.username = username
+        self.password = password
+        self.balance = balance
+        self.address = address
+        self.phonenumber = phonenumber
+
+    def fields(self):
+        return (self.username, self.password, self.balance, self.address, self.phonenumber)
+
+
+class GuidanceOfficer:
+    __slots__ = ("username", "password", "phonenumber", "department")
+
+    def __init__(self, username, password, phonenumber, department):
+        self.username = username
+        self.password = password
+        self.phonenumber = phonenumber
+        self.department = sys.intern(department)
+
+    def fields(self):
+        return (self.username, self.password, self.phonenumber, self.department)
+
+
+class AidRequest:
+    """ One aid request. The request id is its key in aid_requests and is not
+    repeated in the record; documents is a tuple of document ids/paths. """
+    __slots__ = ("username", "aid_type", "description", "documents", "status", "version")
+
+    def __init__(self, username, aid_type, description, documents=(), status="Pending", version=1):
+        self.username = username
+        self.aid_type = sys.intern(aid_type)
+        self.description = description
+        self.documents = tuple(documents)
+        self.status = sys.intern(status)
+        self.version = version
+
+    def fields(self):
+        return (self.username, self.aid_type, self.description, self.documents, self.status, self.version)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["username"], data["aid_type"], data["description"], data["documents"],
+                   data["status"], data.get("version", 1))
+
+    # The JSON form used by the snapshot, the journal and the HTTP service
+    def to_dict(self, request_id):
+        return {
+            "request_id": request_id,
+            "username": self.username,
+            "aid_type": self.aid_type,
+            "description": self.description,
+            "documents": list(self.documents),
+            "status": self.status,
+            "version": self.version
+        }
+
+    def with_status(self, status, version):
+        return AidRequest(self.username, self.aid_type, self.description, self.documents, status, version)
+
+
+# Initialize dictionaries
+admin_dict = {}
+users_dict = {}
+guidance_dict = {}
+headmin_dict = {}
+aid_requests = {}
+# Uploaded documents by id; filled in lazily by documents.py
+document_index = {}
+
+# Creating hundreds of thousands of records sets off the cyclic garbage
+# collector over and over for nothing, since none of them form cycles; the
+# bulk loaders pause it while they run
+@contextmanager
+def gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+# Load admin data
+def readadmin():
+    try:
+        with open(ADMIN_FILE_PATH, "r") as file:
+            for line in file:
+                username, password = line.strip().split(":")
+                admin_dict[username] = password
+    except FileNotFoundError:
+        print(f"Warning: {ADMIN_FILE_PATH} not found.")
+
+# Load user data
+def readuser():
+    line = None
+    try:
+        with open(USER_FILE_PATH, "r") as file, gc_paused():
+            for line in file:
+                parts = line.strip().split(":")
+                if len(parts) < 4:
+                    continue
+                user_id, username, password, balance_and_contact = parts[:4]
+                balance_parts = balance_and_contact.split("|")
+                balance = float(balance_parts[0])
+                address = balance_parts[1] if len(balance_parts) > 1 and balance_parts[1] != "-" else "Not Provided"
+                phonenumber = balance_parts[2] if len(balance_parts) > 2 and balance_parts[2] != "-" else "Not Provided"
+                users_dict[user_id] = User(username, password, balance, address, phonenumber)
+    except FileNotFoundError:
+        print(f"Warning: {USER_FILE_PATH} not found.")
+    except ValueError as e:
+        print(f"Error parsing line: {line}. Error: {e}")
+
+# Load guidance data
+def readguidance():
+    """ Reads guidance user details from the file and loads them into guidance_dict correctly. """
+    try:
+        with open(GUIDANCE_FILE_PATH, "r") as file:
+            for line in file:
+                username, password, phonenumber, department = line.strip().split(":")
+                guidance_dict[username] = GuidanceOfficer(username, password, phonenumber, department)
+    except FileNotFoundError:
+        print(f"Warning: {GUIDANCE_FILE_PATH} not found.")
+
+# Load head minister data
+def readheadminister():
+    try:
+        with open(HEADMIN_FILE_PATH, "r") as file:
+            for line in file:
+                username, password = line.strip().split(":")
+                headmin_dict[username] = password
+    except FileNotFoundError:
+        print(f"Warning: {HEADMIN_FILE_PATH} not found.")
+
+def format_user_line(user_id, user):
+    return f"{user_id}:{user.username}:{user.password}:{user.balance}|{user.address}|{user.phonenumber}\n"
+
+def format_guidance_line(username, user_data):
+    return f"{username}:{user_data.password}:{user_data.phonenumber}:{user_data.department}\n"
+
+# Replace a whole file so that a crash leaves either the old or the new
+# version, never a truncated one: write(file) fills a temp file, which is
+# fsynced and then renamed over path.
+def atomic_write(path, write):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if os.name == "posix":
+        # Make the rename itself durable
+        dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+# User ids and guidance usernames this instance edited or deleted since the
+# file was last rewritten. Other instances append new accounts and rewrite
+# their own edits into the same files, so a rewrite starts from what is on
+# disk and only replaces these lines; everything else is kept as it is.
+changed_users = set()
+changed_guidance = set()
+
+# Lines of users.txt / guidance.txt keyed by their first field, in file order
+def read_lines_by_key(path):
+    lines = {}
+    try:
+        with open(path, "r") as file:
+            for line in file:
+                if line.strip():
+                    lines[line.split(":", 1)[0]] = line if line.endswith("\n") else line + "\n"
+    except FileNotFoundError:
+        pass
+    return lines
+
+def rewrite_changed_lines(path, changed, records, format_line):
+    with file_lock(USER_LOCK_FILE):
+        lines = read_lines_by_key(path)
+        for key in changed:
+            if key in records:
+                lines[key] = format_line(key, records[key])
+            else:
+                lines.pop(key, None)
+        atomic_write(path, lambda file: file.writelines(lines.values()))
+    changed.clear()
+
+def write_users_file():
+    rewrite_changed_lines(USER_FILE_PATH, changed_users, users_dict, format_user_line)
+
+def write_guidance_file():
+    rewrite_changed_lines(GUIDANCE_FILE_PATH, changed_guidance, guidance_dict, format_guidance_line)
+
+# Exclusive advisory lock on a lock file, held across processes so several
+# running copies of the app can share one data directory.
+@contextmanager
+def file_lock(path):
+    with open(path, "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+# Aid requests are stored as a snapshot (aid_requests.txt, one JSON record per
+# line) plus an append-only journal of events. Every create/status change is a single appended line, and
+# the journal is folded back into the snapshot by a background thread once it
+# grows past JOURNAL_COMPACT_THRESHOLD events.
+#
+# Several instances can share the files. Every journal read or write happens
+# under aid_request_lock(), and each instance remembers how far into the live
+# journal it has read. Before writing, an instance reads and merges the events
+# the others appended since then (sync_journal), so its checks see the latest
+# state. Each request carries a version that goes up by one with every status
+# change; a decision based on an older version is rejected with StaleRecordError.
+# The first line of each journal holds a random generation id, which lets an
+# instance notice that another one rotated the journal away for compaction.
+JOURNAL_COMPACT_THRESHOLD = 500
+journal_lock = threading.RLock()
+journal_state = {"events": 0, "offset": 0, "generation": None, "compacting": False, "lock_depth": 0}
+
+class StaleRecordError(Exception):
+    """ Raised when a request changed in another instance since it was read. """
+
+# journal_lock keeps our own threads apart, the lock file keeps other processes
+# out. Re-entrant, since a sync can trigger a full reload while the lock is held.
+@contextmanager
+def aid_request_lock():
+    with journal_lock:
+        journal_state["lock_depth"] += 1
+        try:
+            if journal_state["lock_depth"] > 1:
+                yield
+            else:
+                with file_lock(AID_LOCK_FILE):
+                    yield
+        finally:
+            journal_state["lock_depth"] -= 1
+
+# The snapshot used to be a single pretty-printed JSON array; files in that
+# format are still read, and the next compaction (or "python storage.py
+# migrate-jsonl") rewrites them as JSON Lines.
+def is_legacy_snapshot(file):
+    legacy = file.read(64).lstrip().startswith(b"[")
+    file.seek(0)
+    return legacy
+
+def read_legacy_snapshot(file):
+    loaded_requests = json.loads(file.read())
+    return {req['request_id']: AidRequest.from_dict(req) for req in loaded_requests}
+
+# Lines of the snapshot parsed with one json.loads call
+SNAPSHOT_BATCH_BYTES = 1024 * 1024
+
+# Read the snapshot in batches of lines. A bad line only loses that request:
+# when a batch fails to parse, it is read again a line at a time and each bad
+# line is reported and skipped. Reads from file (opened in binary mode) if
+# given, otherwise opens path.
+def read_aid_requests_snapshot(path=AID_REQUESTS_FILE, file=None):
+    if file is None:
+        if not os.path.exists(path):
+            return {}
+        with open(path, "rb") as file:
+            return read_aid_requests_snapshot(path, file)
+    with gc_paused():
+        if is_legacy_snapshot(file):
+            try:
+                return read_legacy_snapshot(file)
+            except json.JSONDecodeError as e:
+                print(f"Error decoding JSON: {e}")
+                return {}
+        requests = {}
+        line_number = 0
+        text = io.TextIOWrapper(file, encoding="utf-8", errors="replace")
+        try:
+            while True:
+                lines = text.readlines(SNAPSHOT_BATCH_BYTES)
+                if not lines:
+                    break
+                try:
+                    for req in json.loads("[" + ",".join(line for line in lines if line.strip()) + "]"):
+                        requests[req['request_id']] = AidRequest.from_dict(req)
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    for batch_line_number, line in enumerate(lines, line_number + 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            req = json.loads(line)
+                            requests[req['request_id']] = AidRequest.from_dict(req)
+                        except (json.JSONDecodeError, KeyError, TypeError) as e:
+                            print(f"Skipping line {batch_line_number} in {path}: {e!r}")
+                line_number += len(lines)
+        finally:
+            # Leave the caller's file open
+            text.detach()
+        return requests
+
+def apply_journal_event(requests, event):
+    if event["op"] == "create":
+        requests[event["request"]["request_id"]] = AidRequest.from_dict(event["request"])
+    elif event["op"] == "status":
+        details = requests.get(event["request_id"])
+        # Events at or below the current version are already applied
+        if details is not None and event.get("version", details.version + 1) > details.version:
+            requests[event["request_id"]] = details.with_status(event["status"], event.get("version", details.version + 1))
+
+# Replay a journal file from byte offset start. Calls apply(event) for each
+# complete line and returns (events applied, offset after the last complete line).
+# Like read_aid_requests_snapshot, reads from file if given.
+def replay_journal(path, apply, start=0, file=None):
+    if file is None:
+        if not os.path.exists(path):
+            return 0, start
+        with open(path, "rb") as file:
+            return replay_journal(path, apply, start, file)
+    count = 0
+    offset = start
+    file.seek(start)
+    for raw in file:
+        if not raw.endswith(b"\n"):
+            # A crash mid-append can leave a torn last line; it is cut off
+            # before the next append.
+            break
+        offset += len(raw)
+        try:
+            event = json.loads(raw)
+            if event["op"] != "header":
+                apply(event)
+                count += 1
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            print(f"Skipping journal entry at byte {offset - len(raw)} in {path}: {e}")
+    return count, offset
+
+def read_journal_generation(path=AID_JOURNAL_FILE, file=None):
+    if file is None:
+        try:
+            with open(path, "rb") as file:
+                return read_journal_generation(path, file)
+        except FileNotFoundError:
+            return None
+    file.seek(0)
+    first_line = file.readline()
+    try:
+        event = json.loads(first_line)
+        if event.get("op") == "header":
+            return event["generation"]
+    except (json.JSONDecodeError, KeyError, AttributeError):
+        pass
+    # Journals written before generations existed
+    return ""
+
+def open_if_exists(stack, path):
+    try:
+        return stack.enter_context(open(path, "rb"))
+    except FileNotFoundError:
+        return None
+
+# Load aid requests. The lock is only held while the snapshot and journals are
+# opened: an open file keeps reading the same data even after another
+# instance compacts and replaces or removes it, so the slow part (parsing)
+# happens with the other instances free to carry on.
+def load_aid_requests():
+    with ExitStack() as stack:
+        with aid_request_lock():
+            files = [open_if_exists(stack, path)
+                     for path in (AID_REQUESTS_FILE, AID_JOURNAL_COMPACTING_FILE, AID_JOURNAL_FILE)]
+            if os.name != "posix":
+                # Windows can't replace or remove a file that is open, so read
+                # everything before letting the other instances in
+                return read_aid_request_files(*files)
+        return read_aid_request_files(*files)
+
+def read_aid_request_files(snapshot, compacting, journal):
+    requests = read_aid_requests_snapshot(AID_REQUESTS_FILE, snapshot) if snapshot else {}
+    apply = lambda event: apply_journal_event(requests, event)
+    # A compaction in progress (or interrupted) holds its events in the .compacting file
+    if compacting:
+        replay_journal(AID_JOURNAL_COMPACTING_FILE, apply, file=compacting)
+    if journal:
+        journal_state["generation"] = read_journal_generation(AID_JOURNAL_FILE, journal)
+        journal_state["events"], journal_state["offset"] = replay_journal(AID_JOURNAL_FILE, apply, file=journal)
+    else:
+        journal_state.update(generation=None, events=0, offset=0)
+    return requests
+
+# Merge events other instances appended since we last looked. Caller holds
+# aid_request_lock(). Returns False, merging nothing, if the journal was
+# rotated for compaction since; the caller then reloads from the files.
+def sync_journal():
+    with ExitStack() as stack:
+        journal = open_if_exists(stack, AID_JOURNAL_FILE)
+        generation = read_journal_generation(AID_JOURNAL_FILE, journal) if journal else None
+        if generation != journal_state["generation"]:
+            return False
+        if journal:
+            count, journal_state["offset"] = replay_journal(AID_JOURNAL_FILE, merge_journal_event,
+                                                            journal_state["offset"], journal)
+            journal_state["events"] += count
+    return True
+
+def start_new_journal():
+    generation = uuid.uuid4().hex
+    header = (json.dumps({"op": "header", "generation": generation}) + "\n").encode()
+    with open(AID_JOURNAL_FILE, "wb") as file:
+        file.write(header)
+    journal_state.update(generation=generation, offset=len(header), events=0)
+
+# Append several events with a single write
+def append_journal_events(events):
+    # Caller holds aid_request_lock() and has just called sync_journal()
+    if journal_state["generation"] is None:
+        start_new_journal()
+    data = "".join(json.dumps(event) + "\n" for event in events).encode()
+    with open(AID_JOURNAL_FILE, "r+b") as file:
+        # Drop a torn line left by a crash so the new events start on their own line
+        file.truncate(journal_state["offset"])
+        file.seek(journal_state["offset"])
+        file.write(data)
+    journal_state["offset"] += len(data)
+    journal_state["events"] += len(events)
+    if journal_state["events"] >= JOURNAL_COMPACT_THRESHOLD:
+        start_journal_compaction()
+
+def append_journal_event(event):
+    append_journal_events([event])
+
+# Written to a temp path that the caller renames into place under the lock
+def write_aid_requests_snapshot(requests, path):
+    with open(path, "w") as file:
+        file.writelines(json.dumps(details.to_dict(req_id)) + "\n" for req_id, details in requests.items())
+        file.flush()
+        os.fsync(file.fileno())
+
+# Fold the rotated journal into the snapshot. Runs on a background thread and
+# only reads files, so it never touches the live aid_requests dictionary. The
+# slow part happens outside the lock; only the final rename is done under it.
+def compact_journal():
+    temp_path = f"{AID_REQUESTS_FILE}.{os.getpid()}.tmp"
+    try:
+        generation = read_journal_generation(AID_JOURNAL_COMPACTING_FILE)
+        requests = read_aid_requests_snapshot()
+        replay_journal(AID_JOURNAL_COMPACTING_FILE, lambda event: apply_journal_event(requests, event))
+        write_aid_requests_snapshot(requests, temp_path)
+        with aid_request_lock():
+            if read_journal_generation(AID_JOURNAL_COMPACTING_FILE) == generation:
+                os.replace(temp_path, AID_REQUESTS_FILE)
+                os.remove(AID_JOURNAL_COMPACTING_FILE)
+            else:
+                # Another instance finished folding the same journal first
+                # (and may already have rotated a newer one in its place)
+                os.remove(temp_path)
+    except OSError as e:
+        print(f"Error compacting aid request journal: {e}")
+    finally:
+        with journal_lock:
+            journal_state["compacting"] = False
+
+def start_journal_compaction():
+    # Caller holds aid_request_lock(). The live journal is rotated out so new
+    # events keep appending while the old ones are folded into the snapshot.
+    if journal_state["compacting"]:
+        return
+    if not os.path.exists(AID_JOURNAL_COMPACTING_FILE):
+        os.replace(AID_JOURNAL_FILE, AID_JOURNAL_COMPACTING_FILE)
+        start_new_journal()
+    journal_state["compacting"] = True
+    threading.Thread(target=compact_journal, daemon=True).start()
+
+def read_sequences():
+    try:
+        with open(SEQUENCES_FILE, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+def write_sequences(sequences):
+    atomic_write(SEQUENCES_FILE, lambda file: json.dump(sequences, file))
+
+
+# --------------------- WRITE-BEHIND ---------------------
+# Edits and deletes need users.txt / guidance.txt rewritten. Rather
+# than rewriting on every change, the backend marks the file dirty and the
+# rewrite happens once the first change is WRITE_BEHIND_SECONDS old, so a burst
+# of edits costs one write. The owner of the storage thread calls flush()
+# regularly (the GUI from root.after, the server from its event loop), and
+# whatever is still pending is flushed at exit. Appends (new users, the aid
+# request journal) are still written straight away.
+WRITE_BEHIND_SECONDS = 0.5
+# Recent flushes kept for the latency figures
+FLUSH_SAMPLES = 100
+
+class WriteBehind:
+    def __init__(self, delay):
+        self.delay = delay
+        # store name -> (write function, when it was first marked dirty)
+        self.pending = {}
+        self.changes = 0
+        self.flushes = 0
+        # Seconds from the first change to the file being safely on disk
+        self.latencies = deque(maxlen=FLUSH_SAMPLES)
+
+    def mark_dirty(self, name, write):
+        self.changes += 1
+        marked = self.pending[name][1] if name in self.pending else time.monotonic()
+        self.pending[name] = (write, marked)
+
+    def flush(self, force=False):
+        """ Writes every store dirty for at least delay seconds, or all of them with force. """
+        for name, (write, marked) in list(self.pending.items()):
+            if not force and time.monotonic() - marked < self.delay:
+                continue
+            try:
+                write()
+            except OSError as e:
+                # Left pending, so the next flush tries again
+                print(f"Error writing {name}: {e}")
+                continue
+            del self.pending[name]
+            self.flushes += 1
+            self.latencies.append(time.monotonic() - marked)
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            "changes": self.changes,
+            "flushes": self.flushes,
+            "pending": sorted(self.pending),
+            "last_flush_ms": round(self.latencies[-1] * 1000, 1) if latencies else None,
+            "median_flush_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            "max_flush_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+        }
+
+write_behind = WriteBehind(WRITE_BEHIND_SECONDS)
+atexit.register(write_behind.flush, True)
+
+
+# --------------------- BACKENDS ---------------------
+class FileBackend:
+    """ Persists to the original text files. """
+    name = "files"
+
+    def load(self):
+        readadmin()
+        readuser()
+        readguidance()
+        readheadminister()
+        aid_requests.update(load_aid_requests())
+        self.resume_compaction()
+
+    def resume_compaction(self):
+        with aid_request_lock():
+            # Finish a compaction an instance was interrupted in the middle of
+            if os.path.exists(AID_JOURNAL_COMPACTING_FILE):
+                start_journal_compaction()
+
+    def next_sequence(self, kind, count, seed):
+        with file_lock(SEQUENCES_LOCK_FILE):
+            sequences = read_sequences()
+            start = sequences.get(kind)
+            if start is None:
+                start = seed()
+            sequences[kind] = start + count
+            write_sequences(sequences)
+        return start
+
+    def add_user(self, user_id):
+        with file_lock(USER_LOCK_FILE), open(USER_FILE_PATH, "a") as file:
+            file.write(format_user_line(user_id, users_dict[user_id]))
+
+    def add_users(self, user_ids):
+        with file_lock(USER_LOCK_FILE), open(USER_FILE_PATH, "a") as file:
+            file.write("".join(format_user_line(user_id, users_dict[user_id]) for user_id in user_ids))
+
+    def update_user(self, user_id):
+        changed_users.add(user_id)
+        write_behind.mark_dirty("users", write_users_file)
+
+    def delete_user(self, user_id):
+        changed_users.add(user_id)
+        write_behind.mark_dirty("users", write_users_file)
+
+    def save_guidance(self, old_username, username):
+        changed_guidance.update((old_username, username))
+        write_behind.mark_dirty("guidance", write_guidance_file)
+
+    # Holds aid_request_lock() with the loaded requests caught up with every
+    # other instance. When one of them has rotated the journal for compaction,
+    # everything is reloaded first, with the lock released while it parses.
+    @contextmanager
+    def synced_lock(self):
+        while True:
+            with aid_request_lock():
+                if sync_journal():
+                    yield
+                    return
+            reload_aid_requests(load_aid_requests())
+
+    def sync(self):
+        with self.synced_lock():
+            pass
+
+    def add_aid_request(self, request_id, record):
+        with self.synced_lock():
+            append_journal_event({"op": "create", "request": record.to_dict(request_id)})
+
+    def set_aid_request_status(self, request_id, status, expected_version):
+        with self.synced_lock():
+            version = check_version(request_id, expected_version) + 1
+            append_journal_event({"op": "status", "request_id": request_id, "status": status, "version": version})
+        return version
+
+    def set_aid_request_statuses(self, decisions):
+        with self.synced_lock():
+            applied, failed = check_decisions(decisions)
+            if applied:
+                append_journal_events([{"op": "status", "request_id": request_id, "status": status, "version": version}
+                                       for request_id, status, version in applied])
+        return applied, failed
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS admins (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS headministers (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    balance REAL NOT NULL DEFAULT 0,
+    address TEXT NOT NULL DEFAULT 'Not Provided',
+    phonenumber TEXT NOT NULL DEFAULT 'Not Provided'
+);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
+CREATE TABLE IF NOT EXISTS guidance (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    phonenumber TEXT NOT NULL,
+    department TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aid_requests (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id TEXT NOT NULL UNIQUE,
+    username TEXT NOT NULL,
+    aid_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    documents TEXT NOT NULL,
+    status TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_aid_requests_status ON aid_requests (status);
+CREATE INDEX IF NOT EXISTS idx_aid_requests_aid_type ON aid_requests (aid_type);
+CREATE TABLE IF NOT EXISTS sequences (
+    kind TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+class SqliteBackend:
+    """ Persists to an indexed SQLite database, one row per write. """
+    name = "sqlite"
+
+    def __init__(self, path=DATABASE_FILE):
+        self.path = path
+        # The GUI opens the database on its loader thread and then uses it from
+        # the Tk thread, so the connection is not tied to the thread that made
+        # it. Only one thread uses it at a time: the loader until load_all
+        # returns, then the thread that owns storage.
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        # Databases migrated before versioning lack these columns
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(aid_requests)")]
+        with self.conn:
+            if "version" not in columns:
+                self.conn.execute("ALTER TABLE aid_requests ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            if "revision" not in columns:
+                self.conn.execute("ALTER TABLE aid_requests ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_aid_requests_revision ON aid_requests (revision)")
+        # Every write to aid_requests stamps the row with the next revision, so
+        # changes made by other instances are the rows past last_revision
+        self.last_revision = 0
+
+    @contextmanager
+    def write_transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front so two instances can't
+        # read the same value and both act on it
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def load(self):
+        for username, password in self.conn.execute("SELECT username, password FROM admins"):
+            admin_dict[username] = password
+        for username, password in self.conn.execute("SELECT username, password FROM headministers"):
+            headmin_dict[username] = password
+        for row in self.conn.execute("SELECT user_id, username, password, balance, address, phonenumber FROM users"):
+            users_dict[row[0]] = User(*row[1:])
+        for row in self.conn.execute("SELECT username, password, phonenumber, department FROM guidance"):
+            guidance_dict[row[0]] = GuidanceOfficer(*row)
+        for row in self.conn.execute(self.REQUEST_QUERY + " ORDER BY seq"):
+            aid_requests[row[0]] = self._request_record(row)
+            self.last_revision = max(self.last_revision, row[7])
+
+    REQUEST_QUERY = ("SELECT request_id, username, aid_type, description, documents, status, version, revision "
+                     "FROM aid_requests")
+
+    def _request_record(self, row):
+        return AidRequest(row[1], row[2], row[3], json.loads(row[4]), row[5], row[6])
+
+    def _merge_new_rows(self):
+        for row in self.conn.execute(self.REQUEST_QUERY + " WHERE revision > ? ORDER BY revision", (self.last_revision,)).fetchall():
+            merge_aid_request(row[0], self._request_record(row))
+            self.last_revision = row[7]
+
+    def _next_revision(self):
+        return self.conn.execute("SELECT COALESCE(MAX(revision), 0) + 1 FROM aid_requests").fetchone()[0]
+
+    def sync(self):
+        self._merge_new_rows()
+
+    def next_sequence(self, kind, count, seed):
+        with self.write_transaction():
+            row = self.conn.execute("SELECT value FROM sequences WHERE kind = ?", (kind,)).fetchone()
+            start = row[0] if row else seed()
+            self.conn.execute("INSERT OR REPLACE INTO sequences (kind, value) VALUES (?, ?)", (kind, start + count))
+        return start
+
+    def _user_row(self, user_id):
+        user = users_dict[user_id]
+        return (user_id, user.username, user.password, float(user.balance), user.address, user.phonenumber)
+
+    def add_user(self, user_id):
+        with self.conn:
+            self.conn.execute("INSERT INTO users (user_id, username, password, balance, address, phonenumber) "
+                              "VALUES (?, ?, ?, ?, ?, ?)", self._user_row(user_id))
+
+    def add_users(self, user_ids):
+        with self.conn:
+            self.conn.executemany("INSERT INTO users (user_id, username, password, balance, address, phonenumber) "
+                                  "VALUES (?, ?, ?, ?, ?, ?)", [self._user_row(user_id) for user_id in user_ids])
+
+    def update_user(self, user_id):
+        row = self._user_row(user_id)
+        with self.conn:
+            self.conn.execute("UPDATE users SET username = ?, password = ?, balance = ?, address = ?, phonenumber = ? "
+                              "WHERE user_id = ?", row[1:] + row[:1])
+
+    def delete_user(self, user_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+
+    def save_guidance(self, old_username, username):
+        user_data = guidance_dict[username]
+        with self.conn:
+            self.conn.execute("DELETE FROM guidance WHERE username = ?", (old_username,))
+            self.conn.execute("INSERT OR REPLACE INTO guidance (username, password, phonenumber, department) "
+                              "VALUES (?, ?, ?, ?)",
+                              (username, user_data.password, user_data.phonenumber, user_data.department))
+
+    def add_aid_request(self, request_id, record):
+        with self.write_transaction():
+            self._merge_new_rows()
+            revision = self._next_revision()
+            self.conn.execute("INSERT INTO aid_requests (request_id, username, aid_type, description, documents, status, version, revision) "
+                              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              (request_id, record.username, record.aid_type, record.description,
+                               json.dumps(record.documents), record.status, record.version, revision))
+        # Nobody else could write in between, so we are fully caught up
+        self.last_revision = revision
+
+    def set_aid_request_status(self, request_id, status, expected_version):
+        with self.write_transaction():
+            self._merge_new_rows()
+            version = check_version(request_id, expected_version)
+            revision = self._next_revision()
+            cursor = self.conn.execute("UPDATE aid_requests SET status = ?, version = ?, revision = ? "
+                                       "WHERE request_id = ? AND version = ?",
+                                       (status, version + 1, revision, request_id, version))
+            if cursor.rowcount == 0:
+                raise StaleRecordError(f"Aid request {request_id} was changed by someone else.")
+        self.last_revision = revision
+        return version + 1
+
+    def set_aid_request_statuses(self, decisions):
+        with self.write_transaction():
+            self._merge_new_rows()
+            applied, failed = check_decisions(decisions)
+            if applied:
+                revision = self._next_revision()
+                # The write lock is held and we are caught up, so the versions can't move under us
+                self.conn.executemany("UPDATE aid_requests SET status = ?, version = ?, revision = ? "
+                                      "WHERE request_id = ? AND version = ?",
+                                      [(status, version, revision, request_id, version - 1)
+                                       for request_id, status, version in applied])
+                self.last_revision = revision
+        return applied, failed
+
+    def import_loaded_data(self):
+        """ Copies whatever is currently in the module dictionaries into the database. """
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO admins VALUES (?, ?)", admin_dict.items())
+            self.conn.executemany("INSERT OR REPLACE INTO headministers VALUES (?, ?)", headmin_dict.items())
+            self.conn.executemany("INSERT OR REPLACE INTO users (user_id, username, password, balance, address, phonenumber) "
+                                  "VALUES (?, ?, ?, ?, ?, ?)", (self._user_row(user_id) for user_id in users_dict))
+            self.conn.executemany("INSERT OR REPLACE INTO guidance (username, password, phonenumber, department) "
+                                  "VALUES (?, ?, ?, ?)",
+                                  (officer.fields() for officer in guidance_dict.values()))
+            self.conn.executemany("INSERT OR REPLACE INTO aid_requests (request_id, username, aid_type, description, documents, status, version) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                  ((req_id, d.username, d.aid_type, d.description, json.dumps(d.documents),
+                                    d.status, d.version)
+                                   for req_id, d in aid_requests.items()))
+            self.conn.executemany("INSERT OR REPLACE INTO sequences (kind, value) VALUES (?, ?)",
+                                  read_sequences().items())
+
+
+# --------------------- AGGREGATES ---------------------
+class AidRequestStats:
+    """ Running counts of aid requests per status, per aid type and per (status, aid type).
+
+    Updated on every create and status change, so report summaries never have
+    to walk aid_requests.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.total = 0
+        self.by_status = Counter()
+        self.by_aid_type = Counter()
+        self.by_status_and_type = Counter()
+
+    def add(self, details):
+        self.total += 1
+        self.by_status[details.status] += 1
+        self.by_aid_type[details.aid_type] += 1
+        self.by_status_and_type[details.status, details.aid_type] += 1
+
+    def remove(self, details):
+        self.total -= 1
+        self.by_status[details.status] -= 1
+        self.by_aid_type[details.aid_type] -= 1
+        self.by_status_and_type[details.status, details.aid_type] -= 1
+
+    def rebuild(self, requests):
+        self.clear()
+        for details in requests.values():
+            self.add(details)
+
+    def count(self, status=None, aid_type=None):
+        if status is None and aid_type is None:
+            return self.total
+        if aid_type is None:
+            return self.by_status[status]
+        if status is None:
+            return self.by_aid_type[aid_type]
+        return self.by_status_and_type[status, aid_type]
+
+request_stats = AidRequestStats()
+
+
+class AidRequestQueues:
+    """ Request ids per (aid type, status), in submission order.
+
+    Backs the guidance work queue: a page is a slice of one list, so showing
+    it costs the page size, not the number of requests. Next to each list of
+    ids is the sorted list of their submission positions, so a request moving
+    between queues is found and placed with a binary search.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.queues = {}
+        # (aid type, status) -> submission positions of the ids in self.queues
+        self.queue_positions = {}
+        # request id -> submission position; kept when a request changes queue
+        self.positions = {}
+        self.next_position = 0
+
+    def add(self, request_id, details):
+        position = self.positions.get(request_id)
+        if position is None:
+            position = self.positions[request_id] = self.next_position
+            self.next_position += 1
+        key = (details.aid_type, details.status)
+        queue = self.queues.setdefault(key, [])
+        positions = self.queue_positions.setdefault(key, [])
+        if not positions or positions[-1] < position:
+            queue.append(request_id)
+            positions.append(position)
+        else:
+            index = bisect.bisect(positions, position)
+            queue.insert(index, request_id)
+            positions.insert(index, position)
+
+    def remove(self, request_id, details):
+        key = (details.aid_type, details.status)
+        positions = self.queue_positions.get(key)
+        if positions:
+            index = bisect.bisect_left(positions, self.positions[request_id])
+            if index < len(positions) and self.queues[key][index] == request_id:
+                del self.queues[key][index]
+                del positions[index]
+
+    def rebuild(self, requests):
+        self.clear()
+        for request_id, details in requests.items():
+            self.add(request_id, details)
+
+    def count(self, aid_type, status):
+        return len(self.queues.get((aid_type, status), ()))
+
+    def page(self, aid_type, status, start, size):
+        return self.queues.get((aid_type, status), [])[start:start + size]
+
+request_queues = AidRequestQueues()
+
+
+# username -> user ids using it, in the order they were added. Older data has
+# duplicate usernames (two "Abu"s), so one name can map to several ids. The ids
+# are kept as dict keys for O(1) removal while keeping insertion order.
+username_index = {}
+
+def index_user(user_id, username):
+    username_index.setdefault(username, {})[user_id] = None
+
+def unindex_user(user_id, username):
+    user_ids = username_index.get(username)
+    if user_ids is not None:
+        user_ids.pop(user_id, None)
+        if not user_ids:
+            del username_index[username]
+
+def rebuild_username_index():
+    username_index.clear()
+    for user_id, user in users_dict.items():
+        index_user(user_id, user.username)
+
+
+class UserSearchIndex:
+    """ Substring search over user ids and usernames for the search screens.
+
+    Each user is indexed by the trigrams of "id\nusername" (lower-cased). A
+    query of three or more characters only checks the users that contain all
+    of its trigrams. Shorter queries match most users anyway, so they scan in
+    order and stop as soon as enough results are found.
+
+    The index is built on the first search, unless load_all is asked to
+    build it up front (the GUI does, on its loader thread).
+    """
+    # Past this many candidates a trigram lookup is slower than the early-exit scan
+    SCAN_CUTOFF = 5000
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # Users to index on the next search; None once built
+        self.pending_users = None
+        self.keys = {}
+        # user id -> position, so trigram matches can be listed in load order
+        self.order = {}
+        self.next_position = 0
+        self.trigrams = {}
+
+    @staticmethod
+    def key_trigrams(key):
+        return {key[i:i + 3] for i in range(len(key) - 2)}
+
+    def drop_trigrams(self, user_id, key):
+        for trigram in self.key_trigrams(key):
+            user_ids = self.trigrams.get(trigram)
+            if user_ids is not None:
+                user_ids.discard(user_id)
+                if not user_ids:
+                    del self.trigrams[trigram]
+
+    # Add a user, or re-index one whose username changed (keeping its place)
+    def add(self, user_id, username):
+        if self.pending_users is not None:
+            return
+        if user_id in self.keys:
+            self.drop_trigrams(user_id, self.keys[user_id])
+        else:
+            self.order[user_id] = self.next_position
+            self.next_position += 1
+        key = f"{user_id}\n{username}".lower()
+        self.keys[user_id] = key
+        for trigram in self.key_trigrams(key):
+            self.trigrams.setdefault(trigram, set()).add(user_id)
+
+    def remove(self, user_id):
+        if self.pending_users is not None:
+            return
+        key = self.keys.pop(user_id, None)
+        if key is not None:
+            del self.order[user_id]
+            self.drop_trigrams(user_id, key)
+
+    def rebuild(self, users):
+        self.clear()
+        self.pending_users = users
+
+    def build(self):
+        users, self.pending_users = self.pending_users, None
+        for user_id, user in users.items():
+            self.add(user_id, user.username)
+
+    def scan(self, typed, limit, skip):
+        results = []
+        if limit <= 0:
+            return results
+        for user_id, key in self.keys.items():
+            if typed in key and user_id not in skip:
+                results.append(user_id)
+                if len(results) == limit:
+                    break
+        return results
+
+    # Up to limit matching user ids: exact username matches first, the rest in load order
+    def search(self, text, limit):
+        if self.pending_users is not None:
+            self.build()
+        exact = user_ids_for(text)[:limit]
+        typed = text.lower()
+        limit -= len(exact)
+        if len(typed) < 3:
+            return exact + self.scan(typed, limit, exact)
+        candidate_sets = []
+        for trigram in self.key_trigrams(typed):
+            user_ids = self.trigrams.get(trigram)
+            if not user_ids:
+                return exact
+            candidate_sets.append(user_ids)
+        candidate_sets.sort(key=len)
+        if len(candidate_sets[0]) > self.SCAN_CUTOFF:
+            return exact + self.scan(typed, limit, exact)
+        candidates = set.intersection(*candidate_sets)
+        # Trigrams can match out of order ("abc" and "bcd" without "abcd"), so check the substring
+        matches = [user_id for user_id in candidates if user_id not in exact and typed in self.keys[user_id]]
+        matches.sort(key=self.order.__getitem__)
+        return exact + matches[:limit]
+
+user_search = UserSearchIndex()
+
+
+# --------------------- STARTUP CACHE ---------------------
+# Parsing the text files and rebuilding the indexes is most of the start-up
+# time on a big data folder. After a full load, the loaded dictionaries and
+# indexes are dumped with marshal to startup.cache together with the size and
+# mtime of every file they came from. The next start uses the cache if none of
+# those files changed and only replays the journal written since; otherwise it
+# loads the files and writes a new cache. The journal itself is not a key: it
+# is replayed from where the cache left off. Text files backend only; the file
+# can be deleted at any time.
+STARTUP_CACHE_FORMAT = 3
+# Files changed this recently are not cached yet: a second write within the
+# filesystem's timestamp resolution could keep the same size and mtime.
+STARTUP_CACHE_SETTLE_SECONDS = 2.0
+
+def startup_cache_sources():
+    sources = []
+    for path in (ADMIN_FILE_PATH, USER_FILE_PATH, GUIDANCE_FILE_PATH, HEADMIN_FILE_PATH,
+                 AID_REQUESTS_FILE, AID_JOURNAL_COMPACTING_FILE):
+        try:
+            stat = os.stat(path)
+            sources.append((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            sources.append(None)
+    return tuple(sources)
+
+# marshal only takes built-in types, so records are stored column by column:
+# (keys, [all usernames], [all passwords], ...), which also loads faster than
+# a tuple per record
+def record_columns(records):
+    return list(records), list(zip(*(record.fields() for record in records.values())))
+
+def records_from_columns(record_class, columns):
+    keys, fields = columns
+    return dict(zip(keys, map(record_class, *fields))) if keys else {}
+
+def save_startup_cache(sources):
+    settled = time.time_ns() - int(STARTUP_CACHE_SETTLE_SECONDS * 1e9)
+    if any(source and source[1] > settled for source in sources):
+        return
+    cache = {
+        "format": STARTUP_CACHE_FORMAT,
+        "sources": sources,
+        "admin": admin_dict,
+        "users": record_columns(users_dict),
+        "guidance": record_columns(guidance_dict),
+        "headmin": headmin_dict,
+        "aid_requests": record_columns(aid_requests),
+        "journal": (journal_state["generation"], journal_state["offset"], journal_state["events"]),
+        "stats": (request_stats.total, dict(request_stats.by_status), dict(request_stats.by_aid_type),
+                  dict(request_stats.by_status_and_type)),
+        "queues": (request_queues.queues, request_queues.queue_positions, request_queues.positions,
+                   request_queues.next_position),
+        "username_index": username_index,
+    }
+    temp_path = f"{STARTUP_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(marshal.dumps(cache))
+        os.replace(temp_path, STARTUP_CACHE_FILE)
+    except (OSError, ValueError) as e:
+        print(f"Error writing {STARTUP_CACHE_FILE}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+# Fill the loaded data from the cache; returns False if it is missing or stale
+def restore_startup_cache(sources):
+    try:
+        with open(STARTUP_CACHE_FILE, "rb") as file:
+            # marshal.load on the file object reads it in tiny pieces
+            cache = marshal.loads(file.read())
+        if cache["format"] != STARTUP_CACHE_FORMAT or cache["sources"] != sources:
+            return False
+        generation, offset, events = cache["journal"]
+        total, by_status, by_aid_type, by_status_and_type = cache["stats"]
+        queues, queue_positions, positions, next_position = cache["queues"]
+        users = records_from_columns(User, cache["users"])
+        officers = records_from_columns(GuidanceOfficer, cache["guidance"])
+        requests = records_from_columns(AidRequest, cache["aid_requests"])
+    except FileNotFoundError:
+        return False
+    except (OSError, EOFError, ValueError, TypeError, KeyError) as e:
+        print(f"Ignoring unreadable {STARTUP_CACHE_FILE}: {e}")
+        return False
+    admin_dict.update(cache["admin"])
+    users_dict.update(users)
+    guidance_dict.update(officers)
+    headmin_dict.update(cache["headmin"])
+    aid_requests.update(requests)
+    username_index.update(cache["username_index"])
+    request_stats.total = total
+    request_stats.by_status.update(by_status)
+    request_stats.by_aid_type.update(by_aid_type)
+    request_stats.by_status_and_type.update(by_status_and_type)
+    request_queues.queues = queues
+    request_queues.queue_positions = queue_positions
+    request_queues.positions = positions
+    request_queues.next_position = next_position
+    journal_state.update(generation=generation, offset=offset, events=events)
+    return True
+
+
+def clear_loaded_data():
+    for data in (admin_dict, users_dict, guidance_dict, headmin_dict, aid_requests, username_index):
+        data.clear()
+    request_stats.clear()
+    request_queues.clear()
+    user_search.clear()
+
+# One-shot migration: read the text files and copy everything into a new database.
+# The text files are left untouched so the migration can be re-run or rolled back.
+def migrate_files_to_sqlite(path=DATABASE_FILE):
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists; remove it to migrate again.")
+    clear_loaded_data()
+    FileBackend().load()
+    sqlite_backend = SqliteBackend(path)
+    sqlite_backend.import_loaded_data()
+    return sqlite_backend
+
+# Rewrite a legacy array snapshot as JSON Lines, keeping a copy of the original
+# as .bak. Returns the number of requests written, or None if there was nothing
+# to do; a file that doesn't parse raises json.JSONDecodeError and is left alone.
+def migrate_snapshot_to_jsonl():
+    with aid_request_lock():
+        if not os.path.exists(AID_REQUESTS_FILE):
+            return None
+        with open(AID_REQUESTS_FILE, "rb") as file:
+            if not is_legacy_snapshot(file):
+                return None
+            requests = read_legacy_snapshot(file)
+        temp_path = f"{AID_REQUESTS_FILE}.{os.getpid()}.tmp"
+        write_aid_requests_snapshot(requests, temp_path)
+        # Copied rather than moved, so the snapshot never disappears for a
+        # compaction running in another instance
+        shutil.copy2(AID_REQUESTS_FILE, AID_REQUESTS_FILE + ".bak")
+        os.replace(temp_path, AID_REQUESTS_FILE)
+    return len(requests)
+
+# The SQLite database is used as soon as it exists. Set AID_STORAGE=sqlite to
+# migrate automatically on first start, or AID_STORAGE=files to force text files.
+def open_backend():
+    choice = os.environ.get("AID_STORAGE", "sqlite" if os.path.exists(DATABASE_FILE) else "files")
+    if choice == "sqlite":
+        if not os.path.exists(DATABASE_FILE):
+            return migrate_files_to_sqlite(DATABASE_FILE)
+        return SqliteBackend(DATABASE_FILE)
+    return FileBackend()
+
+backend = None
+
+def load_all(build_search_index=False):
+    global backend
+    # Reloading reads the files, so they must hold every change made so far
+    write_behind.flush(force=True)
+    backend = open_backend()
+    clear_loaded_data()
+    with gc_paused():
+        sources = startup_cache_sources() if backend.name == "files" else None
+        if sources and restore_startup_cache(sources):
+            # Events appended since the cache was written; a rotated journal
+            # means a full reload from the files
+            backend.sync()
+            backend.resume_compaction()
+        else:
+            backend.load()
+            request_stats.rebuild(aid_requests)
+            request_queues.rebuild(aid_requests)
+            rebuild_username_index()
+            if sources:
+                save_startup_cache(sources)
+    # Move the loaded records out of the collector's view for good, otherwise
+    # its next full passes would walk all of them again
+    gc.freeze()
+    user_search.rebuild(users_dict)
+    if build_search_index:
+        with gc_paused():
+            user_search.build()
+
+
+# --------------------- WRITES ---------------------
+# All user writes go through here so username_index and user_search stay in
+# step with users_dict
+def user_ids_for(username):
+    return list(username_index.get(username, ()))
+
+def search_users(text, limit):
+    return user_search.search(text, limit)
+
+# True if username belongs to any user other than user_id. Keeping one's
+# current name is always allowed, even where older data already has two users
+# sharing it (the two "Abu"s).
+def username_taken(username, user_id=None):
+    if user_id in users_dict and users_dict[user_id].username == username:
+        return False
+    return any(other_id != user_id for other_id in username_index.get(username, ()))
+
+def add_user(user_id, user):
+    users_dict[user_id] = user
+    index_user(user_id, user.username)
+    user_search.add(user_id, user.username)
+    backend.add_user(user_id)
+
+# Add many users with a single write; users is a list of (user_id, user)
+def add_users(users):
+    for user_id, user in users:
+        users_dict[user_id] = user
+        index_user(user_id, user.username)
+        user_search.add(user_id, user.username)
+    backend.add_users([user_id for user_id, user in users])
+
+def update_user(user_id, user):
+    unindex_user(user_id, users_dict[user_id].username)
+    users_dict[user_id] = user
+    index_user(user_id, user.username)
+    user_search.add(user_id, user.username)
+    backend.update_user(user_id)
+
+def delete_user(user_id):
+    unindex_user(user_id, users_dict.pop(user_id).username)
+    user_search.remove(user_id)
+    backend.delete_user(user_id)
+
+def update_guidance(old_username, user_data):
+    guidance_dict[user_data.username] = user_data
+    if user_data.username != old_username:
+        del guidance_dict[old_username]
+    backend.save_guidance(old_username, user_data.username)
+
+# --------------------- IDS ---------------------
+# Each kind of record gets its own persisted, ever-increasing sequence, so ids
+# are never reused after a deletion. ID_FORMATS gives the prefix and minimum
+# number of digits; numbers simply grow wider once they pass that width.
+ID_FORMATS = {
+    "aid_request": ("AID", 4),
+    "user": ("A", 0),
+    "document": ("DOC", 6),
+}
+
+def id_records(kind):
+    return {"aid_request": aid_requests, "user": users_dict, "document": document_index}[kind]
+
+# Start a sequence that has never been persisted after the highest id already in use
+def highest_existing_id(kind):
+    prefix = ID_FORMATS[kind][0]
+    pattern = re.compile(re.escape(prefix) + r"(\d+)$")
+    highest = 0
+    for record_id in id_records(kind):
+        match = pattern.match(record_id)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest
+
+def allocate_ids(kind, count=1):
+    prefix, width = ID_FORMATS[kind]
+    records = id_records(kind)
+    start = backend.next_sequence(kind, count, lambda: highest_existing_id(kind))
+    ids = [f"{prefix}{number:0{width}d}" for number in range(start + 1, start + count + 1)]
+    # Admins can still type ids by hand, so skip any number that is already taken
+    if any(record_id in records for record_id in ids):
+        ids = [record_id for record_id in ids if record_id not in records]
+        ids += allocate_ids(kind, count - len(ids))
+    return ids
+
+def allocate_id(kind):
+    return allocate_ids(kind)[0]
+
+
+# Views register here to hear about new requests ("created"), decisions
+# ("status"), bulk decisions ("batch", with a list of ids) and full reloads
+# ("reloaded", with no id)
+request_listeners = []
+
+def subscribe_requests(callback):
+    request_listeners.append(callback)
+
+def unsubscribe_requests(callback):
+    if callback in request_listeners:
+        request_listeners.remove(callback)
+
+def notify_request_change(event, request_id):
+    for callback in list(request_listeners):
+        callback(event, request_id)
+
+# Bring one request in memory up to date with a stored record, keeping the
+# stats and views in step. Used both for our own writes and for those read
+# back from other instances. A changed request is replaced by the new record.
+def merge_aid_request(request_id, record, notify=True):
+    details = aid_requests.get(request_id)
+    if details is None:
+        aid_requests[request_id] = record
+        request_stats.add(record)
+        request_queues.add(request_id, record)
+        if notify:
+            notify_request_change("created", request_id)
+    elif details.fields() != record.fields():
+        request_stats.remove(details)
+        request_queues.remove(request_id, details)
+        aid_requests[request_id] = record
+        request_stats.add(record)
+        request_queues.add(request_id, record)
+        if notify:
+            notify_request_change("status", request_id)
+
+def merge_journal_event(event):
+    if event["op"] == "create":
+        merge_aid_request(event["request"]["request_id"], AidRequest.from_dict(event["request"]))
+    elif event["op"] == "status":
+        details = aid_requests.get(event["request_id"])
+        if details is not None and event.get("version", details.version + 1) > details.version:
+            merge_aid_request(event["request_id"], details.with_status(event["status"],
+                                                                       event.get("version", details.version + 1)))
+
+# Swap in a freshly loaded set of requests; views redraw from scratch on "reloaded"
+def reload_aid_requests(requests):
+    aid_requests.clear()
+    aid_requests.update(requests)
+    request_stats.rebuild(aid_requests)
+    request_queues.rebuild(aid_requests)
+    notify_request_change("reloaded", None)
+
+def check_version(request_id, expected_version):
+    version = aid_requests[request_id].version
+    if expected_version is not None and version != expected_version:
+        raise StaleRecordError(f"Aid request {request_id} was changed by someone else.")
+    return version
+
+# Split a batch of (request id, status, expected version) decisions into the
+# ones that can be applied, as (request id, status, new version), and
+# {index in decisions: reason} for the rest. Caller holds the storage lock.
+def check_decisions(decisions):
+    applied = []
+    failed = {}
+    seen = set()
+    for index, (request_id, status, expected_version) in enumerate(decisions):
+        if request_id in seen:
+            failed[index] = "Listed more than once"
+            continue
+        seen.add(request_id)
+        if request_id not in aid_requests:
+            failed[index] = "Request ID not found"
+            continue
+        try:
+            version = check_version(request_id, expected_version)
+        except StaleRecordError as e:
+            failed[index] = str(e)
+            continue
+        applied.append((request_id, status, version + 1))
+    return applied, failed
+
+# Pick up requests created or decided in other instances
+def sync_aid_requests():
+    backend.sync()
+
+# Save aid request
+def save_aid_request(request_id, username, aid_type, description, documents):
+    record = AidRequest(username, aid_type, description, documents)
+    backend.add_aid_request(request_id, record)
+    merge_aid_request(request_id, record)
+
+# Change the status of an aid request (Accepted / Declined). Pass the version
+# the decision was based on to have it rejected with StaleRecordError if the
+# request changed in the meantime.
+def set_aid_request_status(request_id, status, expected_version=None):
+    version = backend.set_aid_request_status(request_id, status, expected_version)
+    merge_aid_request(request_id, aid_requests[request_id].with_status(status, version))
+
+# Decide many requests with one write and one "batch" event for the views.
+# decisions is a list of (request id, status, expected version or None).
+# Returns one result per decision, in the same order: the new status, or the
+# reason it was skipped. A request listed twice keeps the first decision and
+# the later ones say so.
+def set_aid_request_statuses(decisions):
+    applied, failed = backend.set_aid_request_statuses(decisions)
+    for request_id, status, version in applied:
+        merge_aid_request(request_id, aid_requests[request_id].with_status(status, version), notify=False)
+    results = [failed.get(index, status) for index, (request_id, status, expected_version) in enumerate(decisions)]
+    if applied:
+        notify_request_change("batch", [request_id for request_id, status, version in applied])
+    return results
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["migrate"]:
+        migrate_files_to_sqlite(DATABASE_FILE)
+        print(f"Migrated text files into {DATABASE_FILE}")
+    elif sys.argv[1:] == ["migrate-jsonl"]:
+        try:
+            count = migrate_snapshot_to_jsonl()
+        except json.JSONDecodeError as e:
+            sys.exit(f"{AID_REQUESTS_FILE} is not valid JSON ({e}); nothing was changed.")
+        if count is None:
+            print(f"{AID_REQUESTS_FILE} is already in JSON Lines format.")
+        else:
+            print(f"Rewrote {count} aid requests in {AID_REQUESTS_FILE} as JSON Lines; "
+                  f"the old file is kept as {AID_REQUESTS_FILE}.bak")
+    else:
+        print("Usage: python storage.py migrate | migrate-jsonl")